@@ -0,0 +1,230 @@
+"""Benchmark ingestion throughput, search latency/QPS, CRUD throughput and recall.
+
+Runs against an in-memory Qdrant (`--backend memory`), the in-process NumPy index
+(`--backend local`) or a Qdrant server (`--backend qdrant --url http://localhost:6333`)
+using the bundled archive/aclImdb reviews, and writes machine-readable JSON results:
+
+    python benchmark.py --backend memory --docs 2000 --queries 200 --output bench.json
+"""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import uuid
+import numpy as np
+from src.data_loader import DataLoader
+from src.database.qdrant_client import VectorDB
+from src.database.encode_pool import EncodePool
+from config.settings import PLANNER_ENABLED
+
+
+def make_client(backend: str, url: Optional[str] = None, api_key: Optional[str] = None):
+    if backend == "memory":
+        from qdrant_client import QdrantClient
+        return QdrantClient(":memory:")
+    if backend == "local":
+        from src.database.local_index import LocalClient
+        return LocalClient()
+    if backend == "qdrant":
+        from qdrant_client import QdrantClient
+        return QdrantClient(url=url or "http://localhost:6333", api_key=api_key)
+    raise ValueError(f"Unknown backend '{backend}'")
+
+
+def latency_stats(latencies: List[float], wall_time: float) -> Dict[str, float]:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "count": len(latencies),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "qps": len(latencies) / wall_time if wall_time else 0.0
+    }
+
+
+def run_concurrent(fn: Callable[[Any], Any], items: List[Any], concurrency: int) -> Dict[str, float]:
+    """Call fn on every item with `concurrency` threads and report per-call latency and throughput"""
+    def timed(item):
+        start = time.perf_counter()
+        fn(item)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed, items))
+    return latency_stats(latencies, time.perf_counter() - start)
+
+
+def load_corpus(docs: int, queries: int, seed: int):
+    reviews = list(islice(DataLoader.iter_imdb_reviews(), docs + queries))
+    if len(reviews) < docs + queries:
+        raise SystemExit(f"Only {len(reviews)} reviews available under archive/aclImdb")
+    random.Random(seed).shuffle(reviews)
+    # Held-out reviews become queries: their first sentence is a realistic short query
+    query_texts = [review["text"].split(".")[0][:200] for review in reviews[docs:]]
+    return reviews[:docs], query_texts
+
+
+def bench_insert(db: VectorDB, documents: List[Dict[str, Any]], batch_size: int,
+                 encode_workers: int = 0) -> Dict[str, Any]:
+    pool = EncodePool(workers=encode_workers) if encode_workers else None
+    try:
+        if pool is not None:
+            # Start every worker so model loading is not counted as ingestion time
+            with ThreadPoolExecutor(max_workers=pool.workers) as executor:
+                list(executor.map(pool.encode, [["warm up"]] * pool.workers))
+        start = time.perf_counter()
+        ids = db.insert(documents, batch_size=batch_size, encode_pool=pool)
+    finally:
+        if pool is not None:
+            pool.close()
+    elapsed = time.perf_counter() - start
+    return {"ids": ids, "docs": len(ids), "seconds": elapsed, "docs_per_sec": len(ids) / elapsed}
+
+
+def bench_search(db: VectorDB, queries: List[str], limit: int, concurrency_levels: List[int]) -> Dict[str, Any]:
+    filters = {"sentiment": "positive", "rating": {"gte": 8}}
+    results = {}
+    for concurrency in concurrency_levels:
+        results[f"c{concurrency}"] = {
+            "unfiltered": run_concurrent(lambda q: db.search(q, limit=limit), queries, concurrency),
+            "filtered": run_concurrent(lambda q: db.search(q, limit=limit, filters=filters), queries, concurrency)
+        }
+    return results
+
+
+def bench_crud(db: VectorDB, ids: List[str], samples: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    sample = rng.sample(ids, min(samples, len(ids)))
+    results = {
+        "get": run_concurrent(db.get, sample, 1),
+        "update_payload": run_concurrent(lambda i: db.update(i, {"benchmarked": True}, partial=True), sample, 1)
+    }
+    full_updates = [(i, db.get(i)["data"]) for i in sample]
+    results["update_full"] = run_concurrent(
+        lambda item: db.update(item[0], {**item[1], "text": item[1]["text"] + " (edited)"}), full_updates, 1
+    )
+    results["delete"] = run_concurrent(lambda i: db.delete([i]), sample, 1)
+    return results
+
+
+def bench_recall(db: VectorDB, queries: List[str], limit: int) -> Dict[str, Any]:
+    """recall@k of the engine's search against exact brute-force top-k over the stored vectors"""
+    point_ids, vectors, offset = [], [], None
+    while True:
+        page, offset = db.client.scroll(collection_name=db.collection_name, limit=1000, offset=offset,
+                                        with_payload=False, with_vectors=True)
+        for record in page:
+            point_ids.append(record.id)
+            vectors.append(record.vector)
+        if offset is None:
+            break
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    query_vectors = db._encode(queries)
+    query_vectors = query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    k = min(limit, len(point_ids))
+    exact = np.argpartition(-(query_vectors @ matrix.T), k - 1, axis=1)[:, :k]
+
+    recalls = []
+    for query_vector, truth in zip(query_vectors, exact):
+        found = {r["id"] for r in db.search_vector(query_vector, limit=k)}
+        recalls.append(len(found & {point_ids[row] for row in truth}) / k)
+    return {"k": k, "recall_mean": float(np.mean(recalls)), "recall_min": float(np.min(recalls))}
+
+
+def public_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """CLI arguments safe to write into a results file: no API key, no credentials in the URL"""
+    public = {name: value for name, value in vars(args).items() if name != "api_key"}
+    if public.get("url"):
+        parts = urlsplit(public["url"])
+        if parts.username or parts.password:
+            host = parts.hostname + (f":{parts.port}" if parts.port else "")
+            parts = parts._replace(netloc=host)
+        # Query strings may carry tokens (e.g. ?api_key=...)
+        public["url"] = urlunsplit(parts._replace(query="", fragment=""))
+    return public
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "local", "qdrant"], default="memory")
+    parser.add_argument("--url", help="Qdrant URL for --backend qdrant")
+    parser.add_argument("--api-key")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--encode-workers", type=int, default=0,
+                        help="encode on a process pool with this many workers (0 = in-process)")
+    parser.add_argument("--planner", choices=["on", "off"], default="on" if PLANNER_ENABLED else "off",
+                        help="plan filtered searches client-side from count requests (see QueryPlanner)")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated thread counts for search")
+    parser.add_argument("--crud-samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    documents, queries = load_corpus(args.docs, args.queries, args.seed)
+    collection = f"bench_{uuid.uuid4().hex[:8]}"
+    # Embedding and result caches would turn repeated queries into cache hits, so measure the raw pipeline.
+    # Plain one-point-per-document storage whatever CHUNK_WORDS / HYBRID_SEARCH / TEXT_STORE_DIR say:
+    # bench_recall compares point ids and dense vectors with search results
+    db = VectorDB(collection, client=make_client(args.backend, args.url, args.api_key), use_cache=False,
+                  use_result_cache=False, use_planner=args.planner == "on", chunk_words=0, hybrid=False,
+                  text_store=None)
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "args": public_args(args)
+        }
+    }
+    try:
+        insert = bench_insert(db, documents, args.batch_size, args.encode_workers)
+        ids = insert.pop("ids")
+        results["insert"] = insert
+        print(f"insert: {insert['docs_per_sec']:.1f} docs/sec")
+
+        results["search"] = bench_search(db, queries, args.limit, [int(c) for c in args.concurrency.split(",")])
+        for level, modes in results["search"].items():
+            for mode, stats in modes.items():
+                print(f"search {level} {mode}: p50 {stats['p50_ms']:.2f}ms p99 {stats['p99_ms']:.2f}ms "
+                      f"{stats['qps']:.1f} qps")
+
+        results["recall"] = bench_recall(db, queries, args.limit)
+        print(f"recall@{results['recall']['k']}: {results['recall']['recall_mean']:.4f}")
+
+        results["crud"] = bench_crud(db, ids, args.crud_samples, args.seed)
+        for operation, stats in results["crud"].items():
+            print(f"{operation}: {stats['qps']:.1f} ops/sec (p99 {stats['p99_ms']:.2f}ms)")
+    finally:
+        if args.backend == "qdrant":
+            db.drop()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
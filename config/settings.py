@@ -5,4 +5,80 @@ load_dotenv()
 
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-COLLECTION_NAME = "reviews"
\ No newline at end of file
+# "qdrant" for a Qdrant server/cloud, "local" for the in-process NumPy index
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "qdrant")
+# Directory for the local index; unset keeps it in memory only
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH")
+COLLECTION_NAME = "reviews"
+
+# Embedding model
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+VECTOR_SIZE = 384
+# Encoder runtime: "torch" (SentenceTransformer) or "onnx" (ONNX Runtime, int8 unless ONNX_QUANTIZE=false)
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", ".cache/onnx")
+ONNX_QUANTIZE = os.getenv("ONNX_QUANTIZE", "true").lower() == "true"
+
+# Collection storage: VECTOR_QUANTIZATION is "", "scalar" (int8) or "binary"
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "")
+VECTOR_ON_DISK = os.getenv("VECTOR_ON_DISK", "false").lower() == "true"
+HNSW_M = int(os.getenv("HNSW_M")) if os.getenv("HNSW_M") else None
+HNSW_EF_CONSTRUCT = int(os.getenv("HNSW_EF_CONSTRUCT")) if os.getenv("HNSW_EF_CONSTRUCT") else None
+# Threads used to run the encoder off the event loop in AsyncVectorDB
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", "2"))
+# Process pool for bulk ingestion (EncodePool): worker count (0 = one per core), intra-op threads per
+# worker (0 = cores / workers) and multiprocessing start method
+ENCODE_WORKERS = int(os.getenv("ENCODE_WORKERS", "0"))
+ENCODE_WORKER_THREADS = int(os.getenv("ENCODE_WORKER_THREADS", "0"))
+ENCODE_START_METHOD = os.getenv("ENCODE_START_METHOD", "spawn")
+# Query planner: filters matching at most this many points use exact search
+PLANNER_ENABLED = os.getenv("PLANNER_ENABLED", "false").lower() == "true"
+PLANNER_EXACT_THRESHOLD = int(os.getenv("PLANNER_EXACT_THRESHOLD", "1000"))
+PLANNER_STATS_TTL = float(os.getenv("PLANNER_STATS_TTL", "60"))
+PLANNER_STATS_SIZE = int(os.getenv("PLANNER_STATS_SIZE", "1024"))
+# Operations slower than this are logged to the "vectordb.slow_queries" logger (0 disables)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+
+# Long-text chunking: documents over CHUNK_WORDS words are stored as overlapping windows (0 disables)
+CHUNK_WORDS = int(os.getenv("CHUNK_WORDS", "0"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "32"))
+# Chunk hits fetched per requested result before collapsing them per document
+CHUNK_SEARCH_FACTOR = int(os.getenv("CHUNK_SEARCH_FACTOR", "4"))
+
+# MMR re-ranking (mmr_lambda=...) picks from this many candidates per requested result
+MMR_OVERSAMPLE = int(os.getenv("MMR_OVERSAMPLE", "4"))
+
+# Hybrid search: BM25 sparse vectors stored next to the dense vector (see src.database.sparse)
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "false").lower() == "true"
+BM25_VOCAB_PATH = os.getenv("BM25_VOCAB_PATH", "archive/aclImdb/imdb.vocab")
+# JSON statistics written by BM25Encoder.fit(...).save(path); unset uses vocabulary estimates
+BM25_STATS_PATH = os.getenv("BM25_STATS_PATH")
+BM25_AVG_DOC_LEN = float(os.getenv("BM25_AVG_DOC_LEN", "230"))
+
+# Search result cache: LRU entries expire after RESULT_CACHE_TTL seconds or on writes to the collection.
+# Only writes made in this process invalidate it: writes from other processes stay invisible to cached
+# searches for up to RESULT_CACHE_TTL seconds (lower it, or pass use_result_cache=False, if that matters).
+# RESULT_CACHE_SIMILARITY > 0 also reuses results of queries whose embeddings are at least that similar
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1000"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "30"))
+RESULT_CACHE_SIMILARITY = float(os.getenv("RESULT_CACHE_SIMILARITY", "0"))
+
+# Embedding cache (set EMBEDDING_CACHE_DIR to an empty string for memory-only caching)
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+
+# Keep document text in a compressed local blob store under this directory instead of the Qdrant payload,
+# fetched only when results ask for it (empty disables)
+TEXT_STORE_DIR = os.getenv("TEXT_STORE_DIR", "")
+
+# Derive point ids from each document's source file or text, so re-running a load updates instead of duplicating
+DETERMINISTIC_IDS = os.getenv("DETERMINISTIC_IDS", "true").lower() == "true"
+
+# Ingestion batching
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "64"))
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "256"))
+SEARCH_BATCH_SIZE = int(os.getenv("SEARCH_BATCH_SIZE", "64"))
+# Background write queue (WriteQueue): max queued writes before producers block, and how long the
+# writer waits for more writes to fill a batch
+WRITE_QUEUE_DEPTH = int(os.getenv("WRITE_QUEUE_DEPTH", "10000"))
+WRITE_QUEUE_LINGER_MS = float(os.getenv("WRITE_QUEUE_LINGER_MS", "50"))
\ No newline at end of file
@@ -1,8 +1,12 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import json
 import os
 import random
 
+LABEL_SENTIMENTS = {"pos": "positive", "neg": "negative"}
+
 class DataLoader:
     @staticmethod
     def load_all_reviews(limit: int = 100) -> List[Dict[str, Any]]:
@@ -20,106 +24,86 @@ class DataLoader:
     @staticmethod
     def load_imdb_reviews(limit: int = 100) -> List[Dict[str, Any]]:
         """Load IMDB movie reviews from archive folder"""
-        reviews = []
-        base_path = "archive/aclImdb/train"
-        
-        # Load positive reviews
-        pos_path = os.path.join(base_path, "pos")
-        if os.path.exists(pos_path):
-            files = os.listdir(pos_path)[:limit//2]
-            for file in files:
-                try:
-                    with open(os.path.join(pos_path, file), 'r', encoding='utf-8') as f:
-                        text = f.read().strip()
-                        rating = int(file.split('_')[1].split('.')[0]) if '_' in file else 5
-                        reviews.append({
-                            "text": text,
-                            "sentiment": "positive",
-                            "rating": rating,
-                            "word_count": len(text.split()),
-                            "char_count": len(text),
-                            "source": "imdb",
-                            "category": "movie_review",
-                            "language": "english",
-                            "file": file
-                        })
-                except:
-                    continue
-        
-        # Load negative reviews
-        neg_path = os.path.join(base_path, "neg")
-        if os.path.exists(neg_path):
-            files = os.listdir(neg_path)[:limit//2]
-            for file in files:
-                try:
-                    with open(os.path.join(neg_path, file), 'r', encoding='utf-8') as f:
-                        text = f.read().strip()
-                        rating = int(file.split('_')[1].split('.')[0]) if '_' in file else 5
-                        reviews.append({
-                            "text": text,
-                            "sentiment": "negative",
-                            "rating": rating,
-                            "word_count": len(text.split()),
-                            "char_count": len(text),
-                            "source": "imdb",
-                            "category": "movie_review",
-                            "language": "english",
-                            "file": file
-                        })
-                except:
-                    continue
-        
+        reviews = list(islice(DataLoader.iter_imdb_reviews(labels=("pos",)), limit//2))
+        reviews.extend(islice(DataLoader.iter_imdb_reviews(labels=("neg",)), limit//2))
         return reviews
     
     @staticmethod
     def load_sentiment_reviews(limit: int = 100) -> List[Dict[str, Any]]:
         """Load sentiment reviews from archive (1) folder"""
-        reviews = []
-        base_path = "archive (1)/txt_sentoken"
-        
-        # Load positive reviews
-        pos_path = os.path.join(base_path, "pos")
-        if os.path.exists(pos_path):
-            files = os.listdir(pos_path)[:limit//2]
-            for file in files:
-                try:
-                    with open(os.path.join(pos_path, file), 'r', encoding='utf-8') as f:
-                        text = f.read().strip()
-                        reviews.append({
-                            "text": text,
-                            "sentiment": "positive",
-                            "word_count": len(text.split()),
-                            "char_count": len(text),
-                            "source": "sentiment_corpus",
-                            "category": "sentiment_review",
-                            "language": "english",
-                            "file": file
-                        })
-                except:
-                    continue
+        reviews = list(islice(DataLoader.iter_sentiment_reviews(labels=("pos",)), limit//2))
+        reviews.extend(islice(DataLoader.iter_sentiment_reviews(labels=("neg",)), limit//2))
+        return reviews
+    
+    @staticmethod
+    def iter_imdb_reviews(base_path: str = "archive/aclImdb", splits: Iterable[str] = ("train", "test"),
+                          labels: Iterable[str] = ("pos", "neg", "unsup"), workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """Lazily yield IMDB reviews (pos, neg and train/unsup) from every available split"""
+        for split in splits:
+            for label in labels:
+                folder = os.path.join(base_path, split, label)
+                for file, text in DataLoader._iter_text_files(folder, workers):
+                    review = {
+                        "text": text,
+                        "sentiment": LABEL_SENTIMENTS.get(label, "unlabeled"),
+                        "word_count": len(text.split()),
+                        "char_count": len(text),
+                        "source": "imdb",
+                        "category": "movie_review",
+                        "language": "english",
+                        "split": split,
+                        "file": file
+                    }
+                    # unsup files carry a placeholder 0 rating
+                    if label != "unsup":
+                        review["rating"] = int(file.split('_')[1].split('.')[0]) if '_' in file else 5
+                    yield review
+    
+    @staticmethod
+    def iter_sentiment_reviews(base_path: str = "archive (1)/txt_sentoken", labels: Iterable[str] = ("pos", "neg"),
+                               workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """Lazily yield sentiment reviews, reading files on a thread pool"""
+        for label in labels:
+            folder = os.path.join(base_path, label)
+            for file, text in DataLoader._iter_text_files(folder, workers):
+                yield {
+                    "text": text,
+                    "sentiment": LABEL_SENTIMENTS[label],
+                    "word_count": len(text.split()),
+                    "char_count": len(text),
+                    "source": "sentiment_corpus",
+                    "category": "sentiment_review",
+                    "language": "english",
+                    "file": file
+                }
+    
+    @staticmethod
+    def _iter_text_files(folder: str, workers: int = 8, chunk_size: int = 256) -> Iterator[Tuple[str, str]]:
+        """Yield (filename, text) for the .txt files in a folder.
+
+        Directory entries are streamed with os.scandir and read in bounded chunks on a
+        thread pool, so memory stays constant however many files the folder holds.
+        Unreadable files are skipped.
+        """
+        if not os.path.isdir(folder):
+            return
         
-        # Load negative reviews
-        neg_path = os.path.join(base_path, "neg")
-        if os.path.exists(neg_path):
-            files = os.listdir(neg_path)[:limit//2]
-            for file in files:
-                try:
-                    with open(os.path.join(neg_path, file), 'r', encoding='utf-8') as f:
-                        text = f.read().strip()
-                        reviews.append({
-                            "text": text,
-                            "sentiment": "negative",
-                            "word_count": len(text.split()),
-                            "char_count": len(text),
-                            "source": "sentiment_corpus",
-                            "category": "sentiment_review",
-                            "language": "english",
-                            "file": file
-                        })
-                except:
-                    continue
+        def read(entry):
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    return entry.name, f.read().strip()
+            except (OSError, UnicodeDecodeError):
+                return None
         
-        return reviews
+        with os.scandir(folder) as entries, ThreadPoolExecutor(max_workers=workers) as executor:
+            files = (entry for entry in entries if entry.is_file() and entry.name.endswith('.txt'))
+            while True:
+                chunk = list(islice(files, chunk_size))
+                if not chunk:
+                    return
+                for result in executor.map(read, chunk):
+                    if result is not None:
+                        yield result
     
     @staticmethod
     def load_single_text_file(filepath: str) -> Dict[str, Any]:
@@ -149,37 +133,51 @@ class DataLoader:
     @staticmethod
     def load_csv_reviews(filepath: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Load TV show data from CSV file (archive 2)"""
+        reviews = []
+        for batch in DataLoader.iter_csv_review_batches(filepath, limit=limit):
+            reviews.extend(batch)
+        return reviews
+    
+    @staticmethod
+    def iter_csv_review_batches(filepath: str, chunksize: int = 10000,
+                                limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield TV show reviews from a CSV file in batches, transforming each chunk column-wise"""
+        import numpy as np
         import pandas as pd
         try:
-            df = pd.read_csv(filepath, encoding='utf-8')
-            reviews = []
-            for _, row in df.head(limit).iterrows():
+            for df in pd.read_csv(filepath, encoding='utf-8', chunksize=chunksize, nrows=limit):
+                column = lambda name, default: df[name] if name in df else pd.Series(default, index=df.index)
+                
                 # Combine name and description for text content
-                name = str(row.get('Name', '')).strip()
-                description = str(row.get('Description', '')).strip()
-                text_content = f"{name}: {description}"
+                name = column('Name', '').fillna('').astype(str).str.strip()
+                description = column('Description', '').fillna('').astype(str).str.strip()
+                text_content = name + ": " + description
                 
                 # Determine sentiment based on rating
-                rating = float(row.get('Rating', 0))
-                sentiment = "positive" if rating >= 8.0 else "negative" if rating < 6.0 else "neutral"
+                rating = pd.to_numeric(column('Rating', 0), errors='coerce').astype(float)
+                sentiment = np.select([rating >= 8.0, rating < 6.0], ["positive", "negative"], default="neutral")
                 
-                reviews.append({
+                batch = pd.DataFrame({
                     "text": text_content,
                     "sentiment": sentiment,
                     "rating": rating,
-                    "word_count": len(text_content.split()),
-                    "char_count": len(text_content),
+                    "word_count": text_content.str.split().str.len().astype(int),
+                    "char_count": text_content.str.len().astype(int),
                     "source": "csv_dataset",
                     "category": "csv_review",
                     "language": "english",
                     "show_name": name,
-                    "year": str(row.get('Year', '')),
-                    "type": str(row.get('Type', ''))
+                    "year": column('Year', '').fillna('').astype(str),
+                    "type": column('Type', '').fillna('').astype(str)
                 })
-            return reviews
+                records = batch.to_dict('records')
+                # Blank or non-numeric ratings would be stored as NaN, which is not valid JSON and
+                # breaks the rating index; leave the field out, as unlabeled IMDB reviews do
+                for row in np.flatnonzero(rating.isna().to_numpy()):
+                    del records[row]["rating"]
+                yield records
         except Exception as e:
             print(f"Error loading CSV: {e}")
-            return []
     
     @staticmethod
     def load_from_json(filepath: str) -> List[Dict[str, Any]]:
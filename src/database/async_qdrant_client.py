@@ -0,0 +1,295 @@
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import PointStruct, PointVectors, SearchRequest, Filter
+import numpy as np
+from typing import List, Dict, Any, Optional, Iterable, Union
+from functools import partial
+import asyncio
+import logging
+import uuid
+from config.settings import (
+    EMBEDDING_MODEL, ENCODER_BACKEND, ENCODE_BATCH_SIZE, UPSERT_BATCH_SIZE, SEARCH_BATCH_SIZE,
+    VECTOR_QUANTIZATION, VECTOR_ON_DISK, HNSW_M, HNSW_EF_CONSTRUCT, DETERMINISTIC_IDS, MMR_OVERSAMPLE, CHUNK_WORDS,
+    HYBRID_SEARCH, TEXT_STORE_DIR
+)
+from src.database.registry import (
+    get_async_client, get_encoder, get_embedding_cache, get_encode_executor, collection_scope, invalidate_collection,
+    collection_ready, mark_collection_ready
+)
+from src.database.qdrant_client import VectorDB, PayloadSelector, _chunked, collection_options, missing_payload_indexes, search_params
+from src.database.encoders import encoder_name
+from src.database.filters import FilterSpec
+from src.database.ingest import document_id
+from src.database.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncVectorDB:
+    """asyncio counterpart of VectorDB.
+
+    Network I/O goes through AsyncQdrantClient and embedding runs on the shared, bounded
+    encoder thread pool so CPU-bound encoding never blocks the event loop. Call
+    `await db.setup()` once before first use to create the collection and indexes;
+    it is idempotent and only the first call per process makes requests.
+
+    Only plain collections are supported: chunked (chunk_words), hybrid and text-store
+    collections need VectorDB, so those settings (or a hybrid collection found by
+    `setup()`) raise ValueError instead of returning raw chunks or text-less results.
+    """
+
+    def __init__(self, collection_name: str = "documents", client: Optional[AsyncQdrantClient] = None,
+                 model_name: str = EMBEDDING_MODEL, use_cache: bool = True,
+                 quantization: Optional[str] = VECTOR_QUANTIZATION or None, on_disk: bool = VECTOR_ON_DISK,
+                 hnsw_m: Optional[int] = HNSW_M, hnsw_ef_construct: Optional[int] = HNSW_EF_CONSTRUCT,
+                 encoder_backend: str = ENCODER_BACKEND, deterministic_ids: bool = DETERMINISTIC_IDS,
+                 chunk_words: int = CHUNK_WORDS, hybrid: bool = HYBRID_SEARCH,
+                 text_store: Optional[str] = TEXT_STORE_DIR or None):
+        unsupported = [name for name, enabled in (("chunk_words", chunk_words > 0), ("hybrid", hybrid),
+                                                  ("text_store", bool(text_store))) if enabled]
+        if unsupported:
+            raise ValueError(f"AsyncVectorDB does not support {', '.join(unsupported)} (CHUNK_WORDS, HYBRID_SEARCH, "
+                             f"TEXT_STORE_DIR); use VectorDB for collection '{collection_name}'")
+        self.client = client if client is not None else get_async_client()
+        self.model_name = model_name
+        self.encoder_backend = encoder_backend
+        self.encoder_name = encoder_name(model_name, encoder_backend)
+        self.use_cache = use_cache
+        self.collection_name = collection_name
+        self.deterministic_ids = deterministic_ids
+        self.options = collection_options(quantization, on_disk, hnsw_m, hnsw_ef_construct)
+        # Same scope as a VectorDB on this endpoint, so writes here invalidate its cached results
+        self._cache_scope = collection_scope(self.client, collection_name)
+
+    @property
+    def encoder(self):
+        return get_encoder(self.model_name, self.encoder_backend)
+
+    @property
+    def cache(self):
+        return get_embedding_cache(self.encoder_name) if self.use_cache else None
+
+    def _encode_sync(self, texts: List[str], batch_size: int) -> np.ndarray:
+        encode_fn = lambda batch: self.encoder.encode(batch, batch_size=batch_size)
+        if self.cache is not None:
+            return self.cache.encode(texts, encode_fn)
+        return encode_fn(texts)
+
+    async def _encode(self, texts: List[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_encode_executor(), partial(self._encode_sync, texts, batch_size))
+
+    async def _collection_info(self):
+        try:
+            return await self.client.get_collection(self.collection_name)
+        except Exception:
+            return None
+
+    async def setup(self) -> bool:
+        """Create the collection and any missing payload indexes (see VectorDB.setup)"""
+        if collection_ready(self.client, self.collection_name):
+            return False
+
+        created = False
+        info = await self._collection_info()
+        if info is not None and getattr(info.config.params, "sparse_vectors", None):
+            raise ValueError(f"Collection '{self.collection_name}' is a hybrid collection; use VectorDB(hybrid=True)")
+        if info is None:
+            try:
+                await self.client.create_collection(collection_name=self.collection_name, **self.options)
+                created = True
+            except Exception:
+                if await self._collection_info() is None:
+                    raise
+
+        for field_name, schema_type in missing_payload_indexes(info):
+            try:
+                await self.client.create_payload_index(collection_name=self.collection_name, field_name=field_name,
+                                                       field_schema=schema_type)
+                created = True
+            except Exception as e:
+                logger.warning("create_payload_index(%s.%s) failed: %s", self.collection_name, field_name, e)
+                get_metrics().increment("vectordb_setup_errors_total", step="create_payload_index",
+                                        collection=self.collection_name)
+
+        mark_collection_ready(self.client, self.collection_name)
+        return created
+
+    async def insert(self, documents: Iterable[Dict[str, Any]], batch_size: int = UPSERT_BATCH_SIZE,
+                     encode_batch_size: int = ENCODE_BATCH_SIZE) -> List[str]:
+        """Encode and upsert documents in chunks, overlapping encoding with the previous upsert"""
+        ids = []
+        pending = None
+        try:
+            for chunk in _chunked(documents, batch_size):
+                vectors = await self._encode([doc['text'] for doc in chunk], batch_size=encode_batch_size)
+                points = []
+                for doc, vector in zip(chunk, vectors):
+                    doc_id = document_id(doc) if self.deterministic_ids else str(uuid.uuid4())
+                    points.append(PointStruct(id=doc_id, vector=vector.tolist(), payload=doc))
+                    ids.append(doc_id)
+
+                if pending is not None:
+                    await pending
+                pending = asyncio.ensure_future(self.client.upsert(collection_name=self.collection_name,
+                                                                   points=points))
+            if pending is not None:
+                await pending
+        except BaseException:
+            # A later chunk failed: let the upsert already in flight finish instead of orphaning the task
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+            raise
+        finally:
+            self._invalidate()
+        return ids
+
+    def _invalidate(self):
+        invalidate_collection(self._cache_scope)
+
+    async def search(self, query: str, limit: int = 5, filters: FilterSpec = None, hnsw_ef: Optional[int] = None,
+                     rescore: Optional[bool] = None, oversampling: Optional[float] = None,
+                     with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[Dict]:
+        vector = (await self._encode([query]))[0]
+        return await self.search_vector(vector, limit=limit, filters=filters, hnsw_ef=hnsw_ef, rescore=rescore,
+                                        oversampling=oversampling, with_payload=with_payload,
+                                        with_vectors=with_vectors)
+
+    async def search_vector(self, vector: Union[np.ndarray, List[float]], limit: int = 5,
+                            filters: FilterSpec = None, timeout: Optional[int] = None, hnsw_ef: Optional[int] = None,
+                            rescore: Optional[bool] = None, oversampling: Optional[float] = None,
+                            with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[Dict]:
+        results = await self.client.search(
+            collection_name=self.collection_name,
+            query_vector=np.asarray(vector).tolist(),
+            query_filter=VectorDB._build_filter(filters),
+            search_params=search_params(None, hnsw_ef, rescore, oversampling),
+            limit=limit,
+            timeout=timeout,
+            with_payload=with_payload,
+            with_vectors=with_vectors
+        )
+        return [VectorDB._as_result(r, with_vectors) for r in results]
+
+    async def search_many(self, queries: List[str], limit: int = 5,
+                          filters: Union[FilterSpec, List[FilterSpec]] = None,
+                          batch_size: int = SEARCH_BATCH_SIZE, hnsw_ef: Optional[int] = None,
+                          rescore: Optional[bool] = None, oversampling: Optional[float] = None,
+                          with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[List[Dict]]:
+        if not isinstance(filters, list):
+            filters = [filters] * len(queries)
+        if len(filters) != len(queries):
+            raise ValueError("filters must be a dict or a list with one entry per query")
+
+        vectors = await self._encode(list(queries))
+        requests = [
+            SearchRequest(vector=vector.tolist(), filter=VectorDB._build_filter(query_filters), limit=limit,
+                          with_payload=with_payload, with_vector=with_vectors,
+                          params=search_params(None, hnsw_ef, rescore, oversampling))
+            for vector, query_filters in zip(vectors, filters)
+        ]
+        # Batches are independent, so send them concurrently
+        batches = await asyncio.gather(*[
+            self.client.search_batch(collection_name=self.collection_name, requests=chunk)
+            for chunk in _chunked(requests, batch_size)
+        ])
+        return [[VectorDB._as_result(r, with_vectors) for r in results] for batch in batches for results in batch]
+
+    async def recommend(self, positive_ids: List[str], negative_ids: Optional[List[str]] = None,
+                        filters: FilterSpec = None, limit: int = 5, hnsw_ef: Optional[int] = None,
+                        with_payload: PayloadSelector = True, with_vectors: bool = False,
+                        mmr_lambda: Optional[float] = None, mmr_oversample: int = MMR_OVERSAMPLE) -> List[Dict]:
+        diversify = mmr_lambda is not None
+        results = await self.client.recommend(
+            collection_name=self.collection_name,
+            positive=list(positive_ids),
+            negative=list(negative_ids or []),
+            query_filter=VectorDB._build_filter(filters),
+            search_params=search_params(None, hnsw_ef),
+            limit=limit * mmr_oversample if diversify else limit,
+            with_payload=with_payload,
+            with_vectors=with_vectors or diversify
+        )
+        results = [VectorDB._as_result(r, with_vectors or diversify) for r in results]
+        return VectorDB._diversify(results, limit, mmr_lambda, with_vectors) if diversify else results
+
+    @staticmethod
+    def _item(record, with_vectors: bool) -> Dict:
+        item = {"id": record.id, "data": record.payload or {}}
+        if with_vectors:
+            item["vector"] = VectorDB._dense(record.vector)
+        return item
+
+    async def get(self, doc_id: str, with_payload: PayloadSelector = True, with_vectors: bool = False) -> Dict:
+        result = await self.client.retrieve(collection_name=self.collection_name, ids=[doc_id],
+                                            with_payload=with_payload, with_vectors=with_vectors)
+        return self._item(result[0], with_vectors) if result else None
+
+    async def get_many(self, doc_ids: List[str], batch_size: int = UPSERT_BATCH_SIZE,
+                       with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[Dict]:
+        """Fetch many documents with concurrent retrieves of `batch_size` ids; missing ids are left out"""
+        batches = await asyncio.gather(*[
+            self.client.retrieve(collection_name=self.collection_name, ids=chunk, with_payload=with_payload,
+                                 with_vectors=with_vectors)
+            for chunk in _chunked(doc_ids, batch_size)
+        ])
+        found = {str(r.id): r for batch in batches for r in batch}
+        return [{**self._item(found[str(doc_id)], with_vectors), "id": doc_id}
+                for doc_id in doc_ids if str(doc_id) in found]
+
+    async def update(self, doc_id: str, data: Dict[str, Any], partial: bool = False) -> bool:
+        if partial:
+            return await self.update_payload([doc_id], data)
+
+        vector = (await self._encode([data['text']]))[0].tolist()
+        point = PointStruct(id=doc_id, vector=vector, payload=data)
+        await self.client.upsert(collection_name=self.collection_name, points=[point])
+        self._invalidate()
+        return True
+
+    async def update_payload(self, selector: Union[List[str], Dict[str, Any], Filter], data: Dict[str, Any],
+                             overwrite: bool = False) -> bool:
+        points = VectorDB._build_filter(selector) if isinstance(selector, (dict, Filter)) else list(selector)
+        if not isinstance(points, Filter) and not points:
+            return True
+
+        stale = await self._changed_text_ids(points, data['text']) if 'text' in data else []
+        if overwrite:
+            await self.client.overwrite_payload(collection_name=self.collection_name, payload=data, points=points)
+        else:
+            await self.client.set_payload(collection_name=self.collection_name, payload=data, points=points)
+
+        if stale:
+            vector = (await self._encode([data['text']]))[0].tolist()
+            await self.client.update_vectors(
+                collection_name=self.collection_name,
+                points=[PointVectors(id=point_id, vector=vector) for point_id in stale]
+            )
+        self._invalidate()
+        return True
+
+    async def _changed_text_ids(self, points: Union[List[str], Filter], text: str) -> List[str]:
+        if isinstance(points, Filter):
+            records, offset = [], None
+            while True:
+                page, offset = await self.client.scroll(collection_name=self.collection_name, scroll_filter=points,
+                                                        limit=UPSERT_BATCH_SIZE, offset=offset, with_payload=["text"])
+                records.extend(page)
+                if offset is None:
+                    break
+        else:
+            records = await self.client.retrieve(collection_name=self.collection_name, ids=points, with_payload=["text"])
+        return [r.id for r in records if (r.payload or {}).get('text') != text]
+
+    async def delete(self, selector: Union[List[str], Dict[str, Any], Filter], wait: bool = True) -> bool:
+        """Delete documents by id or by filters dict (see VectorDB.delete)"""
+        if isinstance(selector, (dict, Filter)):
+            points = VectorDB._build_filter(selector)
+            if points is None:
+                raise ValueError("An empty filter would delete every document; use drop() instead")
+        else:
+            points = list(selector)
+            if not points:
+                return True
+        await self.client.delete(collection_name=self.collection_name, points_selector=points, wait=wait)
+        self._invalidate()
+        return True
\ No newline at end of file
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Sequence, Tuple
+import uuid
+
+# Payload fields added to every chunk point; stripped again from search results
+CHUNK_FIELDS = ("parent_id", "chunk_index", "chunk_count", "chunk_text")
+COLLAPSE_MODES = ("max", "mean")
+
+
+def check_chunking(size: int, overlap: int):
+    """Raise ValueError unless `overlap` fits windows of `size` words (size <= 0 disables chunking)"""
+    if size > 0 and not 0 <= overlap < size:
+        raise ValueError(f"Chunk overlap must be at least 0 and less than the chunk size ({size} words), got {overlap}")
+
+
+def chunk_text(text: str, size: int, overlap: int = 0) -> List[str]:
+    """Split text into windows of at most `size` words, consecutive windows sharing `overlap` words.
+
+    Texts of up to `size` words (or any text when size <= 0) come back as a single chunk.
+    Raises ValueError unless 0 <= overlap < size.
+    """
+    check_chunking(size, overlap)
+    words = text.split()
+    if size <= 0 or len(words) <= size:
+        return [text]
+    step = size - overlap
+    return [" ".join(words[start:start + size]) for start in range(0, len(words) - overlap, step)]
+
+
+def chunk_id(parent_id: str, index: int) -> str:
+    """Deterministic point id of a document's `index`-th chunk"""
+    return str(uuid.uuid5(uuid.UUID(str(parent_id)), str(index)))
+
+
+def split_document(parent_id: str, doc: Dict[str, Any], size: int, overlap: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """Turn a document into (point id, payload) pairs, one per chunk.
+
+    Every chunk carries the document's metadata, so payload filters behave as before;
+    only the head chunk (index 0) stores the full `text`.
+    """
+    chunks = chunk_text(doc['text'], size, overlap)
+    metadata = {key: value for key, value in doc.items() if key != 'text'}
+    points = []
+    for index, chunk in enumerate(chunks):
+        payload = {**metadata, "parent_id": parent_id, "chunk_index": index, "chunk_count": len(chunks),
+                   "chunk_text": chunk}
+        if index == 0:
+            payload["text"] = doc['text']
+        points.append((chunk_id(parent_id, index), payload))
+    return points
+
+
+def strip_chunk_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in (payload or {}).items() if key not in CHUNK_FIELDS}
+
+
+def collapse_hits(hits: Sequence[Any], limit: int, mode: str = "max") -> List[Tuple[Any, float, List[Any]]]:
+    """Group scored chunk hits by parent document and rank parents by their max or mean chunk score.
+
+    Returns up to `limit` (parent id, score, hits best-first) tuples. Points without a
+    `parent_id` (stored unchunked) form their own group.
+    """
+    if mode not in COLLAPSE_MODES:
+        raise ValueError(f"Unknown collapse mode '{mode}', expected one of {COLLAPSE_MODES}")
+
+    groups: Dict[Any, List[Any]] = {}
+    for hit in hits:
+        groups.setdefault((hit.payload or {}).get("parent_id", hit.id), []).append(hit)
+
+    ranked = []
+    for parent_id, group in groups.items():
+        group.sort(key=lambda hit: hit.score, reverse=True)
+        score = group[0].score if mode == "max" else sum(hit.score for hit in group) / len(group)
+        ranked.append((parent_id, score, group))
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked[:limit]
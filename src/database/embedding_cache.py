@@ -0,0 +1,185 @@
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from threading import Lock
+import hashlib
+import os
+import re
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so use one cache directory per writer there
+    fcntl = None
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a text share a cache entry"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by a hash of model name and normalized text.
+
+    The memory tier is a bounded LRU. The optional disk tier stores float32 rows in a
+    memory-mapped matrix (`vectors.f32`) with an append-only `index.txt` mapping keys
+    to row numbers, so vectors survive across processes and re-indexing runs. Writers
+    allocate rows under an exclusive `fcntl` lock after reading what other processes
+    appended to the index, so several processes can share one directory.
+    """
+
+    def __init__(self, model_name: str, dim: int, cache_dir: Optional[str] = None, max_memory_items: int = 10000):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_memory_items = max_memory_items
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+
+        self._rows: Dict[str, int] = {}
+        self._next_row = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock_file = None
+        # Bytes of index.txt already read into _rows
+        self._index_offset = 0
+        self._dir = None
+        if cache_dir:
+            self._dir = os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+            self._open_disk()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _open_disk(self):
+        os.makedirs(self._dir, exist_ok=True)
+        self._vectors_path = os.path.join(self._dir, "vectors.f32")
+        self._index_path = os.path.join(self._dir, "index.txt")
+        self._lock_file = open(os.path.join(self._dir, "lock"), "a")
+
+        with self._locked():
+            self._read_index()
+            capacity = self._disk_capacity()
+            # Drop index entries whose rows never made it to disk (e.g. after a crash)
+            self._rows = {k: row for k, row in self._rows.items() if row < capacity}
+            self._resize(max(capacity, 1024))
+
+    def _disk_capacity(self) -> int:
+        return os.path.getsize(self._vectors_path) // (self.dim * 4) if os.path.exists(self._vectors_path) else 0
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock on the disk tier, held while reading the index tail and allocating rows"""
+        if self._lock_file is None or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self):
+        """Load index lines appended since the last read, by this or any other process"""
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        # Only whole lines; a torn tail (crashed writer) is skipped and later lines start after it
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                row = int(parts[1])
+                self._rows[parts[0]] = row
+                # Rows are never reused, even those dropped as unwritten
+                self._next_row = max(self._next_row, row + 1)
+        self._index_offset += end
+
+    def _resize(self, capacity: int):
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < capacity * self.dim * 4:
+                f.truncate(capacity * self.dim * 4)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                elif key in self._rows:
+                    row = self._rows[key]
+                    if row >= self._vectors.shape[0]:
+                        # Another process grew the file past our mapping
+                        self._resize(self._disk_capacity())
+                    vector = np.array(self._vectors[row])
+                    self._remember(key, vector)
+                results.append(vector)
+        return results
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                self._remember(self.key(text), np.asarray(vector, dtype=np.float32))
+            if self._vectors is None:
+                return
+
+            with self._locked():
+                # Rows other writers took since our last look must not be handed out again
+                self._read_index()
+                new_rows = []
+                for text, vector in zip(texts, vectors):
+                    key = self.key(text)
+                    if key in self._rows:
+                        continue
+                    row = self._next_row
+                    self._next_row += 1
+                    self._rows[key] = row
+                    new_rows.append((key, row, vector))
+                if not new_rows:
+                    return
+
+                needed = self._next_row
+                if needed > self._vectors.shape[0]:
+                    self._resize(max(needed, self._vectors.shape[0] * 2, self._disk_capacity()))
+                for _, row, vector in new_rows:
+                    self._vectors[row] = vector
+                # Vectors are flushed before the index so it never points at unwritten rows
+                self._vectors.flush()
+                lines = "".join(f"{key} {row}\n" for key, row, _ in new_rows).encode("utf-8")
+                with open(self._index_path, "ab") as f:
+                    f.write(lines)
+                    end = f.tell()
+                # Our own lines are already in _rows; skip re-reading them if nobody wrote in between
+                if end - len(lines) == self._index_offset:
+                    self._index_offset = end
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Return vectors for `texts`, calling `encode_fn` only for distinct cache misses"""
+        cached = self.get_many(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        self.hits += len(texts) - sum(1 for vector in cached if vector is None)
+        self.misses += len(missing)
+
+        if missing:
+            encoded = np.asarray(encode_fn(missing), dtype=np.float32)
+            self.put_many(missing, encoded)
+            by_text = dict(zip(missing, encoded))
+            cached = [vector if vector is not None else by_text[text] for text, vector in zip(texts, cached)]
+
+        if not cached:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(cached)
\ No newline at end of file
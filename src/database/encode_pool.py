@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import List, Optional, Tuple
+import os
+import numpy as np
+from config.settings import (
+    EMBEDDING_MODEL, ENCODER_BACKEND, ENCODE_BATCH_SIZE, VECTOR_SIZE, ENCODE_WORKERS, ENCODE_WORKER_THREADS,
+    ENCODE_START_METHOD
+)
+from src.database.encoders import encoder_name, load_encoder
+
+# Set in each worker process by _init_worker
+_worker_encoder = None
+
+
+def _init_worker(model_name: str, backend: str, threads: int):
+    # Pin the BLAS/OpenMP and torch pools before the model is loaded, so workers don't oversubscribe cores
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    if backend == "torch":
+        import torch
+        torch.set_num_threads(threads)
+    global _worker_encoder
+    _worker_encoder = load_encoder(model_name, backend, threads=threads)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> Tuple[str, Tuple[int, ...]]:
+    """Encode texts into a new shared-memory block and return its name and shape; the caller unlinks it"""
+    vectors = np.asarray(_worker_encoder.encode(texts, batch_size=batch_size), dtype=np.float32)
+    block = shared_memory.SharedMemory(create=True, size=max(vectors.nbytes, 1))
+    np.ndarray(vectors.shape, dtype=np.float32, buffer=block.buf)[:] = vectors
+    block.close()
+    return block.name, vectors.shape
+
+
+def _take_block(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float32, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+class EncodePool:
+    """Sentence encoding spread over worker processes, for CPU-bound bulk ingestion.
+
+    With the onnx backend the model is exported in the creating process before any worker
+    starts. Each worker loads the encoder once and pins its intra-op threads to `threads_per_worker`,
+    so the pool uses `workers * threads_per_worker` cores. Embeddings come back as
+    shared-memory blocks: only a block name crosses the process boundary, never the vectors.
+
+    `encode(texts, batch_size)` matches the encoder interface and may be called from several
+    threads at once; `VectorDB.insert(..., encode_pool=pool)` keeps every worker busy that way.
+    With the default "spawn" start method, scripts creating a pool need an
+    `if __name__ == "__main__":` guard.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, backend: str = ENCODER_BACKEND,
+                 workers: int = ENCODE_WORKERS, threads_per_worker: int = ENCODE_WORKER_THREADS,
+                 start_method: str = ENCODE_START_METHOD):
+        cores = os.cpu_count() or 1
+        self.workers = workers or cores
+        self.threads_per_worker = threads_per_worker or max(1, cores // self.workers)
+        self.encoder_name = encoder_name(model_name, backend)
+        if backend == "onnx":
+            # Export (or just check) the model here, once, so a cold cache isn't exported by every worker
+            load_encoder(model_name, backend, threads=1)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context(start_method),
+                                             initializer=_init_worker,
+                                             initargs=(model_name, backend, self.threads_per_worker))
+
+    def encode(self, texts: List[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, VECTOR_SIZE), dtype=np.float32)
+        name, shape = self._executor.submit(_encode_in_worker, list(texts), batch_size).result()
+        return _take_block(name, shape)
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self) -> "EncodePool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,167 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from config.settings import ONNX_MODEL_DIR, ONNX_QUANTIZE
+
+try:
+    import fcntl
+except ImportError:  # Windows: exports are not serialized across processes there
+    fcntl = None
+
+ENCODER_BACKENDS = ("torch", "onnx")
+
+
+def encoder_name(model_name: str, backend: str = "torch", quantize: bool = ONNX_QUANTIZE) -> str:
+    """Identity of an encoder's embedding space, used to key caches and shared encoders.
+
+    The PyTorch encoder keeps the bare model name so existing embedding caches stay valid;
+    ONNX output differs slightly (and more so when quantized), so it gets its own name.
+    """
+    if backend == "torch":
+        return model_name
+    if backend == "onnx":
+        return f"{model_name}@onnx-{'int8' if quantize else 'fp32'}"
+    raise ValueError(f"Unknown encoder backend '{backend}', expected one of {ENCODER_BACKENDS}")
+
+
+def load_encoder(model_name: str, backend: str = "torch", quantize: bool = ONNX_QUANTIZE,
+                 threads: Optional[int] = None):
+    """Create an encoder exposing `encode(texts, batch_size) -> np.ndarray`"""
+    encoder_name(model_name, backend, quantize)  # validates the backend
+    if backend == "onnx":
+        return OnnxEncoder(model_name, quantize=quantize, threads=threads)
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+@contextmanager
+def _export_lock(model_dir: str) -> Iterator[None]:
+    """Exclusive lock, across processes, on exporting the model into `model_dir`"""
+    os.makedirs(os.path.dirname(model_dir) or ".", exist_ok=True)
+    with open(model_dir + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class OnnxEncoder:
+    """Sentence encoder running a transformer exported to ONNX on ONNX Runtime (CPU).
+
+    On first use the SentenceTransformer model is exported to `model_dir` (and, with
+    quantize=True, dynamically quantized to int8); later loads need only onnxruntime and
+    the saved tokenizer. Exports run under a file lock into a staging directory whose
+    files are then renamed into place, model files last, so concurrent processes never
+    see a half-written model. Mean pooling and L2 normalisation reproduce the
+    SentenceTransformer pipeline of mean-pooling models such as all-MiniLM-L6-v2.
+
+    Texts are sorted by token length and each batch is padded only to its own longest
+    member (rounded up to a multiple of 8), so short queries never pay for long reviews.
+    """
+
+    PAD_MULTIPLE = 8
+
+    def __init__(self, model_name: str, model_dir: Optional[str] = ONNX_MODEL_DIR, quantize: bool = ONNX_QUANTIZE,
+                 threads: Optional[int] = None):
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError("The onnx encoder backend needs the onnxruntime and transformers packages") from e
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.model_dir = os.path.join(model_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+        model_path = os.path.join(self.model_dir, "model.int8.onnx" if quantize else "model.onnx")
+        if not os.path.exists(model_path):
+            with _export_lock(self.model_dir):
+                # Another process may have finished the export while we waited for the lock
+                if not os.path.exists(model_path):
+                    self._export()
+
+        with open(os.path.join(self.model_dir, "encoder.json"), encoding="utf-8") as f:
+            config = json.load(f)
+        self.max_length = config["max_length"]
+        self.dim = config["dim"]
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _export(self):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        model = SentenceTransformer(self.model_name, device="cpu")
+        pooling = model[1]
+        if not getattr(pooling, "pooling_mode_mean_tokens", False):
+            raise ValueError(f"'{self.model_name}' does not use mean pooling; the onnx backend only supports mean pooling")
+
+        parent = os.path.dirname(self.model_dir)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".export-", dir=parent)
+        try:
+            transformer = model[0].auto_model.eval()
+            model.tokenizer.save_pretrained(staging)
+            sample = model.tokenizer(["export sample"], return_tensors="pt")
+            input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+            dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+
+            fp32_path = os.path.join(staging, "model.onnx")
+            with torch.no_grad():
+                torch.onnx.export(transformer, tuple(sample[name] for name in input_names), fp32_path,
+                                  input_names=input_names, output_names=["last_hidden_state"],
+                                  dynamic_axes=dynamic_axes, opset_version=14)
+            if self.quantize:
+                quantize_dynamic(fp32_path, os.path.join(staging, "model.int8.onnx"), weight_type=QuantType.QInt8)
+
+            with open(os.path.join(staging, "encoder.json"), "w", encoding="utf-8") as f:
+                json.dump({"model_name": self.model_name, "max_length": model.max_seq_length,
+                           "dim": model.get_sentence_embedding_dimension()}, f)
+
+            # Each rename is atomic; model files go last, so a visible model means its tokenizer
+            # and encoder.json are complete too
+            os.makedirs(self.model_dir, exist_ok=True)
+            for name in sorted(os.listdir(staging), key=lambda name: name.endswith(".onnx")):
+                os.replace(os.path.join(staging, name), os.path.join(self.model_dir, name))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _run(self, batch: Dict[str, Any]) -> np.ndarray:
+        feeds = {name: np.asarray(batch[name], dtype=np.int64) for name in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        mask = feeds["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Embed a list of texts; rows are returned in input order"""
+        texts = list(texts)
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        order = np.argsort([len(ids) for ids in encoded["input_ids"]], kind="stable")
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            batch = self.tokenizer.pad({key: [encoded[key][row] for row in rows] for key in encoded.keys()},
+                                       padding="longest", pad_to_multiple_of=self.PAD_MULTIPLE, return_tensors="np")
+            embeddings[rows] = self._run(batch)
+        return embeddings
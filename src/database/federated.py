@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Optional, Union
+import heapq
+import math
+from src.database.qdrant_client import VectorDB
+from src.database.filters import FilterSpec
+
+
+class FederatedSearch:
+    """Search several collections at once and merge their top-k by score.
+
+    The query is embedded once per encoder, every collection is searched concurrently,
+    and collections that fail or miss the timeout are reported in `errors` while the
+    remaining results are still returned.
+    """
+
+    def __init__(self, collections: Union[List[str], Dict[str, VectorDB]], max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        if not isinstance(collections, dict):
+            collections = {name: VectorDB(name) for name in collections}
+        self.collections = collections
+        self.timeout = timeout
+        self.errors: Dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or len(collections) or 1)
+
+    def search(self, query: str, limit: int = 5, filters: FilterSpec = None,
+               timeout: Optional[float] = None) -> List[Dict]:
+        timeout = timeout if timeout is not None else self.timeout
+        self.errors = {}
+
+        vectors = {}
+        for db in self.collections.values():
+            if db.encoder_name not in vectors:
+                vectors[db.encoder_name] = db._encode([query])[0]
+
+        # The server-side timeout is whole seconds; the client-side wait enforces the exact deadline
+        server_timeout = math.ceil(timeout) if timeout is not None else None
+        futures = {
+            self._executor.submit(db.search_vector, vectors[db.encoder_name], limit, filters, server_timeout): name
+            for name, db in self.collections.items()
+        }
+        done, not_done = wait(futures, timeout=timeout)
+
+        per_collection = []
+        for future in done:
+            name = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                self.errors[name] = str(e)
+                continue
+            for result in results:
+                result['collection'] = name
+            per_collection.append(results)
+        for future in not_done:
+            future.cancel()
+            self.errors[futures[future]] = "timed out"
+
+        # Each list is already sorted by score, so a k-way heap merge yields the global top-k
+        merged = heapq.merge(*per_collection, key=lambda r: -r['score'])
+        return [result for _, result in zip(range(limit), merged)]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
\ No newline at end of file
@@ -0,0 +1,110 @@
+from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny, MatchExcept, Range, PayloadSchemaType
+from typing import Any, Dict, List, Optional, Union
+
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+NUMERIC_SCHEMAS = (PayloadSchemaType.INTEGER, PayloadSchemaType.FLOAT)
+
+FilterSpec = Union[Dict[str, Any], Filter, None]
+
+
+def build_filter(filters: FilterSpec, indexes: Optional[Dict[str, PayloadSchemaType]] = None,
+                 strict: bool = False) -> Optional[Filter]:
+    """Compile a filters dict into a Qdrant `Filter`.
+
+    Plain `{"field": value}` entries stay exact matches, so existing callers keep working.
+    On top of that a field may map to
+      - a list (any-of): `{"sentiment": ["positive", "neutral"]}`
+      - an operator dict: `{"rating": {"gte": 8}}`, `{"source": {"in": [...]}}`,
+        `{"source": {"nin": [...]}}`, `{"sentiment": {"ne": "negative"}}`, `{"rating": {"eq": 9}}`
+    and the reserved keys `$and`, `$or` (lists of filter dicts) and `$not` (a filter dict)
+    nest boolean groups. Fields are checked against `indexes` (field -> payload schema):
+    ranges need a numeric index and values must match the index type. With strict=True,
+    fields without an index are rejected too. Raises ValueError on invalid filters.
+    """
+    if filters is None or isinstance(filters, Filter):
+        return filters
+    if not filters:
+        return None
+    return _compile(filters, indexes or {}, strict)
+
+
+def _compile(spec: Dict[str, Any], indexes: Dict[str, PayloadSchemaType], strict: bool) -> Filter:
+    if not isinstance(spec, dict):
+        raise ValueError(f"Filter group must be a dict, got {spec!r}")
+
+    must, should, must_not = [], [], []
+    for key, value in spec.items():
+        if key == "$and":
+            must.extend(_compile(group, indexes, strict) for group in _groups(key, value))
+        elif key == "$or":
+            should.append(Filter(should=[_compile(group, indexes, strict) for group in _groups(key, value)]))
+        elif key == "$not":
+            must_not.append(_compile(value, indexes, strict))
+        elif key.startswith("$"):
+            raise ValueError(f"Unknown filter operator '{key}'")
+        else:
+            field_must, field_must_not = _field_conditions(key, value, indexes, strict)
+            must.extend(field_must)
+            must_not.extend(field_must_not)
+
+    # A lone $or group is flattened so simple disjunctions stay a single level deep
+    if len(should) == 1 and not must and not must_not:
+        return should[0]
+    return Filter(must=must + should or None, must_not=must_not or None)
+
+
+def _groups(key: str, value: Any) -> List[Dict[str, Any]]:
+    if not isinstance(value, list) or not value:
+        raise ValueError(f"'{key}' expects a non-empty list of filter dicts")
+    return value
+
+
+def _field_conditions(field: str, value: Any, indexes: Dict[str, PayloadSchemaType], strict: bool):
+    schema = indexes.get(field)
+    if schema is None and strict:
+        raise ValueError(f"Field '{field}' has no payload index")
+
+    if isinstance(value, list):
+        value = {"in": value}
+    if not isinstance(value, dict):
+        value = {"eq": value}
+
+    must, must_not = [], []
+    bounds = {}
+    for op, operand in value.items():
+        if op in RANGE_OPERATORS:
+            if schema is not None and schema not in NUMERIC_SCHEMAS:
+                raise ValueError(f"Range filter on '{field}' needs a numeric index, not {schema}")
+            if isinstance(operand, bool) or not isinstance(operand, (int, float)):
+                raise ValueError(f"Range bound '{op}' on '{field}' must be a number")
+            bounds[op] = operand
+        elif op == "eq":
+            must.append(FieldCondition(key=field, match=MatchValue(value=_check_value(field, operand, schema))))
+        elif op == "ne":
+            must_not.append(FieldCondition(key=field, match=MatchValue(value=_check_value(field, operand, schema))))
+        elif op == "in":
+            must.append(FieldCondition(key=field, match=MatchAny(any=_check_values(field, operand, schema))))
+        elif op == "nin":
+            must.append(FieldCondition(key=field, match=MatchExcept(**{"except": _check_values(field, operand, schema)})))
+        else:
+            raise ValueError(f"Unknown operator '{op}' for field '{field}'")
+
+    if bounds:
+        must.append(FieldCondition(key=field, range=Range(**bounds)))
+    return must, must_not
+
+
+def _check_values(field: str, values: Any, schema: Optional[PayloadSchemaType]) -> List[Any]:
+    if not isinstance(values, (list, tuple, set)) or not values:
+        raise ValueError(f"Any-of filter on '{field}' expects a non-empty list")
+    return [_check_value(field, value, schema) for value in values]
+
+
+def _check_value(field: str, value: Any, schema: Optional[PayloadSchemaType]) -> Any:
+    if schema == PayloadSchemaType.KEYWORD and not isinstance(value, str):
+        raise ValueError(f"'{field}' is a keyword index; expected a string, got {value!r}")
+    if schema == PayloadSchemaType.INTEGER and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ValueError(f"'{field}' is an integer index; expected an int, got {value!r}")
+    if not isinstance(value, (str, int, bool)):
+        raise ValueError(f"Exact match on '{field}' supports str, int and bool values, got {value!r}")
+    return value
\ No newline at end of file
@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Set
+import hashlib
+import json
+import os
+import uuid
+from src.database.embedding_cache import normalize_text
+
+ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "vectordb/documents")
+# Fields that locate a document in its source (the aclImdb files repeat names across splits and labels)
+SOURCE_KEY_FIELDS = ("source", "split", "sentiment", "file")
+# Fields left out of the key of documents without a file: the text is hashed separately, and the
+# counts only follow from it
+TEXT_DERIVED_FIELDS = ("text", "word_count", "char_count")
+
+
+def document_id(doc: Dict[str, Any]) -> str:
+    """Deterministic point id for a document.
+
+    Documents loaded from files are identified by where they came from, so re-running a
+    load maps every review to the same id; anything else by a hash of its normalized text
+    and its other fields, so rows sharing a text but not their labels (e.g. sentiment or
+    rating) stay separate points.
+    """
+    if doc.get("file"):
+        key = "file:" + "/".join(str(doc.get(field, "")) for field in SOURCE_KEY_FIELDS)
+    else:
+        labels = {field: value for field, value in doc.items() if field not in TEXT_DERIVED_FIELDS}
+        key = "text:" + normalize_text(doc['text']) + "\n" + json.dumps(labels, sort_keys=True, default=str)
+    return str(uuid.uuid5(ID_NAMESPACE, key))
+
+
+class IngestCheckpoint:
+    """Append-only record of the insert batches that reached the database.
+
+    Each line holds a batch number and a digest of its ids, so a re-run over the same
+    document stream can skip finished batches without embedding them again, while a
+    changed stream (different ids at that position) is re-ingested.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted run
+                        break
+                    self._done.add(self._key(entry["batch"], entry["digest"]))
+
+    @staticmethod
+    def digest(ids: List[str]) -> str:
+        return hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _key(batch: int, digest: str) -> str:
+        return f"{batch}:{digest}"
+
+    def is_done(self, batch: int, ids: List[str]) -> bool:
+        return self._key(batch, self.digest(ids)) in self._done
+
+    def mark_done(self, batch: int, ids: List[str]):
+        digest = self.digest(ids)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"batch": batch, "digest": digest, "points": len(ids)}) + "\n")
+        self._done.add(self._key(batch, digest))
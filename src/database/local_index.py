@@ -0,0 +1,550 @@
+from qdrant_client.models import (
+    Filter, FieldCondition, MatchValue, MatchAny, MatchExcept, Range, HasIdCondition,
+    PointStruct, PointVectors, SearchRequest, ScoredPoint, Record, CountResult, UpdateResult, UpdateStatus,
+    FilterSelector, PointIdsList, NamedSparseVector, SparseVector, CollectionInfo, CollectionStatus,
+    OptimizersStatusOneOf, CollectionConfig, CollectionParams, VectorParams, Distance, SparseVectorParams, HnswConfig,
+    OptimizersConfig, WalConfig, PayloadIndexInfo, PayloadSchemaType
+)
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+from threading import RLock
+import json
+import math
+import os
+import shutil
+
+_DONE = UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+
+def _numeric(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+class LocalCollection:
+    """One collection held in process: a contiguous matrix of unit-length float32 vectors
+    (memory-mapped when the collection has a directory), a payload list, lazily built
+    columnar copies of the payload fields that filters touch, and inverted indexes for
+    named sparse vectors.
+    """
+
+    def __init__(self, dim: int, path: Optional[str] = None):
+        self.dim = dim
+        self.path = path
+        self.lock = RLock()
+        self.ids: List[Any] = []
+        self.payloads: List[Optional[Dict[str, Any]]] = []
+        self.rows: Dict[Any, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self._values: Dict[str, np.ndarray] = {}
+        self._numbers: Dict[str, np.ndarray] = {}
+        # Sparse vector name -> term index -> {row: weight}, plus each row's terms for removal
+        self._postings: Dict[str, Dict[int, Dict[int, float]]] = {}
+        self._row_terms: Dict[str, Dict[int, List[int]]] = {}
+        # Collection metadata reported by get_collection and kept in collection.json
+        self.sparse_names: List[str] = []
+        self.payload_schema: Dict[str, PayloadSchemaType] = {}
+        self._log = None
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._vectors_path = os.path.join(path, "vectors.f32")
+            self._replay(os.path.join(path, "points.jsonl"))
+            self._log = open(os.path.join(path, "points.jsonl"), "a", encoding="utf-8")
+        self._reserve(max(len(self.ids), 1024))
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    def _reserve(self, capacity: int):
+        if capacity <= self.vectors.shape[0]:
+            return
+        if self.path:
+            if isinstance(self.vectors, np.memmap):
+                self.vectors.flush()
+            with open(self._vectors_path, "ab") as f:
+                if f.tell() < capacity * self.dim * 4:
+                    f.truncate(capacity * self.dim * 4)
+            self.vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        else:
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:self.count] = self.vectors[:self.count]
+            self.vectors = vectors
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.count] = self.alive[:self.count]
+        self.alive = alive
+        for field in list(self._values):
+            self._values[field] = np.resize(self._values[field], capacity)
+            numbers = np.full(capacity, np.nan)
+            numbers[:self.count] = self._numbers[field][:self.count]
+            self._numbers[field] = numbers
+
+    def _replay(self, log_path: str):
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    break
+                if entry["op"] == "upsert":
+                    row = entry["row"]
+                    while len(self.ids) <= row:
+                        self.ids.append(None)
+                        self.payloads.append(None)
+                    self.ids[row] = entry["id"]
+                    self.payloads[row] = entry["payload"]
+                    self.rows[entry["id"]] = row
+                    self._clear_sparse(row)
+                    for name, (indices, values) in entry.get("sparse", {}).items():
+                        self._set_sparse(name, row, indices, values)
+                elif entry["op"] == "sparse":
+                    for name, (indices, values) in entry["sparse"].items():
+                        self._set_sparse(name, self.rows[entry["id"]], indices, values)
+                elif entry["op"] == "payload":
+                    for point_id in entry["ids"]:
+                        self._apply_payload(self.rows[point_id], entry["payload"], entry["overwrite"])
+                elif entry["op"] == "delete":
+                    for point_id in entry["ids"]:
+                        self.rows.pop(point_id, None)
+        self._vectors_path = os.path.join(self.path, "vectors.f32")
+        size = os.path.getsize(self._vectors_path) // (self.dim * 4) if os.path.exists(self._vectors_path) else 0
+        if size:
+            self.vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(size, self.dim))
+        # Sized to the vector file's capacity, which _reserve will not grow again
+        self.alive = np.zeros(max(len(self.ids), size), dtype=bool)
+        self.alive[list(self.rows.values())] = True
+
+    def _write_log(self, entry: Dict[str, Any]):
+        if self._log is not None:
+            self._log.write(json.dumps(entry) + "\n")
+
+    def _flush(self):
+        if self._log is not None:
+            if isinstance(self.vectors, np.memmap):
+                self.vectors.flush()
+            self._log.flush()
+
+    def _apply_payload(self, row: int, payload: Dict[str, Any], overwrite: bool):
+        if overwrite or self.payloads[row] is None:
+            self.payloads[row] = dict(payload)
+        else:
+            self.payloads[row] = {**self.payloads[row], **payload}
+        self._update_columns(row)
+
+    def _update_columns(self, row: int):
+        payload = self.payloads[row] or {}
+        for field in self._values:
+            value = payload.get(field)
+            self._values[field][row] = value
+            self._numbers[field][row] = _numeric(value)
+
+    def _column(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        if field not in self._values:
+            capacity = self.vectors.shape[0]
+            values = np.empty(capacity, dtype=object)
+            numbers = np.full(capacity, np.nan)
+            for row, payload in enumerate(self.payloads):
+                value = (payload or {}).get(field)
+                values[row] = value
+                numbers[row] = _numeric(value)
+            self._values[field] = values
+            self._numbers[field] = numbers
+        return self._values[field][:self.count], self._numbers[field][:self.count]
+
+    @staticmethod
+    def _any_of(values: np.ndarray, options: Sequence[Any]) -> np.ndarray:
+        # Equality per option keeps mixed-type object columns out of numpy's sort-based isin
+        mask = np.zeros(values.shape[0], dtype=bool)
+        for option in options:
+            mask |= values == option
+        return mask
+
+    @staticmethod
+    def _split_vector(vector: Any) -> Tuple[Optional[Any], Dict[str, SparseVector]]:
+        """(dense vector or None, named sparse vectors) from a point's `vector` field"""
+        if not isinstance(vector, dict):
+            return vector, {}
+        sparse = {name: value for name, value in vector.items() if isinstance(value, SparseVector)}
+        named_dense = [name for name, value in vector.items() if name and name not in sparse]
+        if named_dense:
+            raise ValueError(f"Local index only supports the unnamed dense vector, got {named_dense}")
+        return vector.get(""), sparse
+
+    def _set_sparse(self, name: str, row: int, indices: Sequence[int], values: Sequence[float]):
+        postings = self._postings.setdefault(name, {})
+        row_terms = self._row_terms.setdefault(name, {})
+        for index in row_terms.pop(row, ()):
+            postings[index].pop(row, None)
+        for index, value in zip(indices, values):
+            postings.setdefault(index, {})[row] = value
+        row_terms[row] = list(indices)
+
+    def _clear_sparse(self, row: int):
+        for name in self._row_terms:
+            self._set_sparse(name, row, (), ())
+
+    @staticmethod
+    def _normalize(vector: Any) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+        return vector / np.where(norm == 0, 1, norm)
+
+    def upsert(self, points: Sequence[PointStruct]):
+        with self.lock:
+            for point in points:
+                row = self.rows.get(point.id)
+                if row is None:
+                    row = self.count
+                    if row >= self.vectors.shape[0]:
+                        self._reserve(max(row + 1, self.vectors.shape[0] * 2))
+                    self.ids.append(point.id)
+                    self.payloads.append(None)
+                    self.rows[point.id] = row
+                dense, sparse = self._split_vector(point.vector)
+                self.vectors[row] = self._normalize(dense) if dense is not None else 0
+                self._clear_sparse(row)
+                for name, vector in sparse.items():
+                    self._set_sparse(name, row, vector.indices, vector.values)
+                self.payloads[row] = dict(point.payload or {})
+                self.alive[row] = True
+                self._update_columns(row)
+                entry = {"op": "upsert", "id": point.id, "row": row, "payload": self.payloads[row]}
+                if sparse:
+                    entry["sparse"] = {name: [vector.indices, vector.values] for name, vector in sparse.items()}
+                self._write_log(entry)
+            self._flush()
+
+    def update_vectors(self, points: Sequence[PointVectors]):
+        with self.lock:
+            for point in points:
+                row = self.rows.get(point.id)
+                if row is None:
+                    continue
+                dense, sparse = self._split_vector(point.vector)
+                if dense is not None:
+                    self.vectors[row] = self._normalize(dense)
+                if sparse:
+                    for name, vector in sparse.items():
+                        self._set_sparse(name, row, vector.indices, vector.values)
+                    self._write_log({"op": "sparse", "id": point.id,
+                                     "sparse": {name: [v.indices, v.values] for name, v in sparse.items()}})
+            self._flush()
+
+    def set_payload(self, point_ids: List[Any], payload: Dict[str, Any], overwrite: bool = False):
+        with self.lock:
+            point_ids = [point_id for point_id in point_ids if point_id in self.rows]
+            for point_id in point_ids:
+                self._apply_payload(self.rows[point_id], payload, overwrite)
+            self._write_log({"op": "payload", "ids": point_ids, "payload": payload, "overwrite": overwrite})
+            self._flush()
+
+    def delete(self, point_ids: List[Any]):
+        with self.lock:
+            for point_id in point_ids:
+                row = self.rows.pop(point_id, None)
+                if row is not None:
+                    self.alive[row] = False
+            self._write_log({"op": "delete", "ids": list(point_ids)})
+            self._flush()
+
+    def mask(self, query_filter: Optional[Filter]) -> np.ndarray:
+        """Boolean mask over rows of live points matching `query_filter`"""
+        alive = self.alive[:self.count]
+        if query_filter is None:
+            return alive.copy()
+        return alive & self._filter_mask(query_filter)
+
+    def _filter_mask(self, query_filter: Filter) -> np.ndarray:
+        mask = np.ones(self.count, dtype=bool)
+        for condition in query_filter.must or []:
+            mask &= self._condition_mask(condition)
+        if query_filter.should:
+            should = np.zeros(self.count, dtype=bool)
+            for condition in query_filter.should:
+                should |= self._condition_mask(condition)
+            mask &= should
+        for condition in query_filter.must_not or []:
+            mask &= ~self._condition_mask(condition)
+        return mask
+
+    def _condition_mask(self, condition: Any) -> np.ndarray:
+        if isinstance(condition, Filter):
+            return self._filter_mask(condition)
+        if isinstance(condition, HasIdCondition):
+            mask = np.zeros(self.count, dtype=bool)
+            mask[[self.rows[i] for i in condition.has_id if i in self.rows]] = True
+            return mask
+        if not isinstance(condition, FieldCondition):
+            raise ValueError(f"Local index does not support {type(condition).__name__} filters")
+
+        values, numbers = self._column(condition.key)
+        if isinstance(condition.match, MatchValue):
+            return values == condition.match.value
+        if isinstance(condition.match, MatchAny):
+            return self._any_of(values, condition.match.any)
+        if isinstance(condition.match, MatchExcept):
+            return (values != None) & ~self._any_of(values, condition.match.except_)
+        if condition.range is not None:
+            mask = ~np.isnan(numbers)
+            bounds = condition.range
+            with np.errstate(invalid="ignore"):
+                if bounds.gt is not None:
+                    mask &= numbers > bounds.gt
+                if bounds.gte is not None:
+                    mask &= numbers >= bounds.gte
+                if bounds.lt is not None:
+                    mask &= numbers < bounds.lt
+                if bounds.lte is not None:
+                    mask &= numbers <= bounds.lte
+            return mask
+        raise ValueError(f"Local index does not support condition on '{condition.key}'")
+
+    def top_k(self, query: np.ndarray, mask: np.ndarray, limit: int, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine top-k over masked rows with one matrix-vector product and argpartition"""
+        candidates = np.flatnonzero(mask)
+        k = min(limit + offset, candidates.size)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = self.vectors[candidates] @ self._normalize(query) if candidates.size < self.count \
+            else self.vectors[:self.count] @ self._normalize(query)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")][offset:]
+        return candidates[top], scores[top]
+
+    def sparse_top_k(self, name: str, query: SparseVector, mask: np.ndarray, limit: int,
+                     offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Dot-product top-k over masked rows sharing at least one term with the query"""
+        scores = np.zeros(self.count, dtype=np.float32)
+        touched = np.zeros(self.count, dtype=bool)
+        postings = self._postings.get(name, {})
+        for index, weight in zip(query.indices, query.values):
+            rows = postings.get(index)
+            if rows:
+                row_ids = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+                scores[row_ids] += weight * np.fromiter(rows.values(), dtype=np.float32, count=len(rows))
+                touched[row_ids] = True
+        candidates = np.flatnonzero(mask & touched)
+        k = min(limit + offset, candidates.size)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        candidate_scores = scores[candidates]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")][offset:]
+        return candidates[top], candidate_scores[top]
+
+
+class LocalClient:
+    """Drop-in, in-process stand-in for the QdrantClient methods VectorDB uses.
+
+    Collections live in memory, or under `path` as a memory-mapped vector file plus an
+    append-only payload log. Only cosine distance on the unnamed dense vector, named
+    sparse vectors (dot product) and scalar payload filters (match, any-of, except,
+    range, has-id and nested boolean filters) are supported.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._collections: Dict[str, LocalCollection] = {}
+        self._lock = RLock()
+        if path and os.path.isdir(path):
+            for name in os.listdir(path):
+                meta_path = os.path.join(path, name, "collection.json")
+                if os.path.exists(meta_path):
+                    with open(meta_path, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                    collection = LocalCollection(meta["size"], os.path.join(path, name))
+                    collection.sparse_names = meta.get("sparse_vectors", [])
+                    collection.payload_schema = {field: PayloadSchemaType(schema)
+                                                 for field, schema in meta.get("payload_schema", {}).items()}
+                    self._collections[name] = collection
+
+    def _get(self, collection_name: str) -> LocalCollection:
+        try:
+            return self._collections[collection_name]
+        except KeyError:
+            raise ValueError(f"Collection {collection_name} not found")
+
+    def _point_ids(self, collection: LocalCollection, selector: Any) -> List[Any]:
+        if isinstance(selector, FilterSelector):
+            selector = selector.filter
+        if isinstance(selector, PointIdsList):
+            selector = selector.points
+        if isinstance(selector, Filter):
+            return [collection.ids[row] for row in np.flatnonzero(collection.mask(selector))]
+        return list(selector)
+
+    def _records(self, collection: LocalCollection, rows: Sequence[int], with_payload: Any = True,
+                 with_vectors: bool = False) -> List[Dict[str, Any]]:
+        records = []
+        for row in rows:
+            payload = collection.payloads[row]
+            if with_payload is False:
+                payload = None
+            elif with_payload is not True:
+                payload = {k: v for k, v in (payload or {}).items() if k in with_payload}
+            vector = collection.vectors[row].tolist() if with_vectors else None
+            records.append({"id": collection.ids[row], "payload": payload, "vector": vector})
+        return records
+
+    def get_collections(self):
+        return list(self._collections)
+
+    def get_collection(self, collection_name: str) -> CollectionInfo:
+        """Collection info shaped like Qdrant's: point counts, vector params and the payload schema"""
+        collection = self._get(collection_name)
+        with collection.lock:
+            rows = np.flatnonzero(collection.mask(None))
+            payloads = [collection.payloads[row] or {} for row in rows]
+            payload_schema = {field: PayloadIndexInfo(data_type=schema, points=sum(field in p for p in payloads))
+                              for field, schema in collection.payload_schema.items()}
+        params = CollectionParams(vectors=VectorParams(size=collection.dim, distance=Distance.COSINE),
+                                  sparse_vectors={name: SparseVectorParams() for name in collection.sparse_names} or None)
+        # Indexing options have no meaning for exact search; zeros stand in for Qdrant's settings
+        config = CollectionConfig(params=params, hnsw_config=HnswConfig(m=0, ef_construct=0, full_scan_threshold=0),
+                                  optimizer_config=OptimizersConfig(deleted_threshold=0, vacuum_min_vector_number=0,
+                                                                    default_segment_number=0, flush_interval_sec=0,
+                                                                    max_optimization_threads=0),
+                                  wal_config=WalConfig(wal_capacity_mb=0, wal_segments_ahead=0))
+        return CollectionInfo(status=CollectionStatus.GREEN, optimizer_status=OptimizersStatusOneOf.OK,
+                              vectors_count=len(rows), indexed_vectors_count=0, points_count=len(rows),
+                              segments_count=1, config=config, payload_schema=payload_schema)
+
+    def create_collection(self, collection_name: str, vectors_config: Any,
+                          sparse_vectors_config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> bool:
+        with self._lock:
+            if collection_name in self._collections:
+                raise ValueError(f"Collection {collection_name} already exists")
+            path = os.path.join(self.path, collection_name) if self.path else None
+            collection = LocalCollection(vectors_config.size, path)
+            collection.sparse_names = list(sparse_vectors_config or {})
+            self._save_meta(collection)
+            self._collections[collection_name] = collection
+        return True
+
+    @staticmethod
+    def _save_meta(collection: LocalCollection):
+        if collection.path:
+            with open(os.path.join(collection.path, "collection.json"), "w", encoding="utf-8") as f:
+                json.dump({"size": collection.dim, "sparse_vectors": collection.sparse_names,
+                           "payload_schema": {field: schema.value for field, schema in collection.payload_schema.items()}}, f)
+
+    def delete_collection(self, collection_name: str, **kwargs: Any) -> bool:
+        with self._lock:
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None and collection.path:
+                if collection._log is not None:
+                    collection._log.close()
+                shutil.rmtree(collection.path, ignore_errors=True)
+        return True
+
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema: Any = None, **kwargs: Any):
+        collection = self._get(collection_name)
+        with collection.lock:
+            collection._column(field_name)
+            if field_schema is not None:
+                collection.payload_schema[field_name] = PayloadSchemaType(getattr(field_schema, "value", field_schema))
+                self._save_meta(collection)
+        return _DONE
+
+    def upsert(self, collection_name: str, points: Sequence[PointStruct], **kwargs: Any) -> UpdateResult:
+        self._get(collection_name).upsert(points)
+        return _DONE
+
+    def update_vectors(self, collection_name: str, points: Sequence[PointVectors], **kwargs: Any) -> UpdateResult:
+        self._get(collection_name).update_vectors(points)
+        return _DONE
+
+    def set_payload(self, collection_name: str, payload: Dict[str, Any], points: Any, **kwargs: Any) -> UpdateResult:
+        collection = self._get(collection_name)
+        collection.set_payload(self._point_ids(collection, points), payload)
+        return _DONE
+
+    def overwrite_payload(self, collection_name: str, payload: Dict[str, Any], points: Any, **kwargs: Any) -> UpdateResult:
+        collection = self._get(collection_name)
+        collection.set_payload(self._point_ids(collection, points), payload, overwrite=True)
+        return _DONE
+
+    def delete(self, collection_name: str, points_selector: Any, **kwargs: Any) -> UpdateResult:
+        collection = self._get(collection_name)
+        collection.delete(self._point_ids(collection, points_selector))
+        return _DONE
+
+    def count(self, collection_name: str, count_filter: Optional[Filter] = None, **kwargs: Any) -> CountResult:
+        return CountResult(count=int(self._get(collection_name).mask(count_filter).sum()))
+
+    def retrieve(self, collection_name: str, ids: Sequence[Any], with_payload: Any = True,
+                 with_vectors: bool = False, **kwargs: Any) -> List[Record]:
+        collection = self._get(collection_name)
+        with collection.lock:
+            rows = [collection.rows[i] for i in ids if i in collection.rows]
+            return [Record(**r) for r in self._records(collection, rows, with_payload, with_vectors)]
+
+    def scroll(self, collection_name: str, scroll_filter: Optional[Filter] = None, limit: int = 10,
+               offset: Optional[Any] = None, with_payload: Any = True, with_vectors: bool = False,
+               **kwargs: Any) -> Tuple[List[Record], Optional[Any]]:
+        collection = self._get(collection_name)
+        with collection.lock:
+            rows = np.flatnonzero(collection.mask(scroll_filter))
+            if offset is not None:
+                rows = rows[rows >= collection.rows.get(offset, collection.count)]
+            page, rest = rows[:limit], rows[limit:limit + 1]
+            records = [Record(**r) for r in self._records(collection, page, with_payload, with_vectors)]
+            return records, (collection.ids[rest[0]] if rest.size else None)
+
+    def search(self, collection_name: str, query_vector: Any, query_filter: Optional[Filter] = None,
+               limit: int = 10, offset: Optional[int] = None, with_payload: Any = True,
+               with_vectors: bool = False, score_threshold: Optional[float] = None, **kwargs: Any) -> List[ScoredPoint]:
+        collection = self._get(collection_name)
+        with collection.lock:
+            if isinstance(query_vector, NamedSparseVector):
+                rows, scores = collection.sparse_top_k(query_vector.name, query_vector.vector,
+                                                       collection.mask(query_filter), limit, offset or 0)
+            else:
+                rows, scores = collection.top_k(np.asarray(query_vector), collection.mask(query_filter),
+                                                limit, offset or 0)
+            records = self._records(collection, rows, with_payload, with_vectors)
+        return [
+            ScoredPoint(version=0, score=float(score), **record)
+            for record, score in zip(records, scores)
+            if score_threshold is None or score >= score_threshold
+        ]
+
+    def recommend(self, collection_name: str, positive: Sequence[Any], negative: Optional[Sequence[Any]] = None,
+                  query_filter: Optional[Filter] = None, limit: int = 10, offset: int = 0, with_payload: Any = True,
+                  with_vectors: bool = False, score_threshold: Optional[float] = None,
+                  **kwargs: Any) -> List[ScoredPoint]:
+        """Qdrant's average_vector strategy: search with 2 * mean(positive) - mean(negative), minus the examples"""
+        collection = self._get(collection_name)
+        with collection.lock:
+            def mean(ids: Sequence[Any]) -> np.ndarray:
+                missing = [i for i in ids if i not in collection.rows]
+                if missing:
+                    raise ValueError(f"Points {missing} not found in {collection_name}")
+                return collection.vectors[[collection.rows[i] for i in ids]].mean(axis=0)
+
+            query = mean(positive)
+            if negative:
+                query = query + (query - mean(negative))
+        examples = Filter(must_not=[HasIdCondition(has_id=list(positive) + list(negative or []))])
+        return self.search(collection_name, query, query_filter=Filter(must=[query_filter, examples])
+                           if query_filter is not None else examples, limit=limit, offset=offset,
+                           with_payload=with_payload, with_vectors=with_vectors, score_threshold=score_threshold)
+
+    def search_batch(self, collection_name: str, requests: Sequence[SearchRequest], **kwargs: Any) -> List[List[ScoredPoint]]:
+        return [
+            self.search(collection_name, request.vector, query_filter=request.filter, limit=request.limit,
+                        offset=request.offset, with_payload=request.with_payload if request.with_payload is not None else True,
+                        with_vectors=bool(request.with_vector), score_threshold=request.score_threshold)
+            for request in requests
+        ]
+
+    def close(self, **kwargs: Any):
+        for collection in self._collections.values():
+            with collection.lock:
+                collection._flush()
\ No newline at end of file
@@ -0,0 +1,172 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from threading import Lock
+import bisect
+import logging
+import time
+from config.settings import SLOW_QUERY_MS
+
+slow_query_logger = logging.getLogger("vectordb.slow_queries")
+
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 8, 32, 128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+class MetricsRegistry:
+    """Thread-safe in-process counters and histograms with Prometheus text export.
+
+    Histograms whose name ends in `_seconds` use latency buckets, the rest use
+    size buckets (batch sizes, bytes).
+    """
+
+    # Callers skip work that only feeds metrics (e.g. measuring payload bytes) when a sink is not enabled
+    enabled = True
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = defaultdict(dict)
+
+    def increment(self, name: str, value: float = 1, **labels: Any):
+        with self._lock:
+            self._counters[name][_label_key(labels)] += value
+
+    def observe(self, name: str, value: float, **labels: Any):
+        buckets = TIME_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+        key = _label_key(labels)
+        with self._lock:
+            # Per-bucket counts followed by the running sum and count
+            state = self._histograms[name].get(key)
+            if state is None:
+                state = self._histograms[name][key] = [0.0] * (len(buckets) + 2)
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view: counters by label set, histograms as count/sum/mean"""
+        with self._lock:
+            counters = {name: {_label_text(k): v for k, v in series.items()} for name, series in self._counters.items()}
+            histograms = {
+                name: {_label_text(k): {"count": s[-1], "sum": s[-2], "mean": s[-2] / s[-1] if s[-1] else 0.0}
+                       for k, s in series.items()}
+                for name, series in self._histograms.items()
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        def labels_text(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(key) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{labels_text(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                buckets = TIME_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+                lines.append(f"# TYPE {name} histogram")
+                for key, state in series.items():
+                    cumulative = 0.0
+                    for bound, count in zip(buckets, state):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{labels_text(key, ('le', str(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{labels_text(key, ('le', '+Inf'))} {state[-1]}")
+                    lines.append(f"{name}_sum{labels_text(key)} {state[-2]}")
+                    lines.append(f"{name}_count{labels_text(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class NullMetrics:
+    """Sink that discards everything, for callers that want zero instrumentation overhead"""
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: Any):
+        pass
+
+    def observe(self, name: str, value: float, **labels: Any):
+        pass
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    """Return the process-wide metrics sink"""
+    return _metrics
+
+
+def set_metrics(sink: Any):
+    """Replace the process-wide sink; anything with `increment` and `observe` works (plus an
+    optional `enabled` flag, False to skip work that only feeds metrics)"""
+    global _metrics
+    _metrics = sink
+
+
+class OperationTimer:
+    """Times one VectorDB operation and its encode / serialize / server phases.
+
+    Used as a context manager; on exit it records `vectordb_operation_seconds`,
+    `vectordb_phase_seconds` and `vectordb_operations_total{status}`, and logs the
+    operation's `details` (query, filters, plan) to the slow-query log when it ran
+    longer than `slow_query_ms`.
+    """
+
+    def __init__(self, sink: Any, operation: str, collection: str, slow_query_ms: float = SLOW_QUERY_MS):
+        self.sink = sink
+        self.operation = operation
+        self.collection = collection
+        self.slow_query_ms = slow_query_ms
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.details: Dict[str, Any] = {}
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def __enter__(self) -> "OperationTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._start
+        labels = {"operation": self.operation, "collection": self.collection}
+        self.sink.observe("vectordb_operation_seconds", self.elapsed, **labels)
+        for phase, seconds in self.phases.items():
+            self.sink.observe("vectordb_phase_seconds", seconds, phase=phase, **labels)
+        self.sink.increment("vectordb_operations_total", status="error" if exc_type else "ok", **labels)
+
+        if self.slow_query_ms and self.elapsed * 1000 >= self.slow_query_ms:
+            phases = ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.phases.items())
+            slow_query_logger.warning("slow %s on %s: %.1fms (%s) %s", self.operation, self.collection,
+                                      self.elapsed * 1000, phases, self.details)
+        return False
\ No newline at end of file
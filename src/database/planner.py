@@ -0,0 +1,111 @@
+from qdrant_client.models import Filter, SearchParams
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from threading import Lock
+import time
+from config.settings import PLANNER_EXACT_THRESHOLD, PLANNER_STATS_TTL, PLANNER_STATS_SIZE
+
+
+@dataclass
+class QueryPlan:
+    strategy: str  # "hnsw", "hnsw_boosted" or "exact"
+    estimated_matches: Optional[int] = None
+    total_points: Optional[int] = None
+    hnsw_ef: Optional[int] = None
+
+    @property
+    def search_params(self) -> Optional[SearchParams]:
+        if self.strategy == "exact":
+            return SearchParams(exact=True)
+        if self.hnsw_ef is not None:
+            return SearchParams(hnsw_ef=self.hnsw_ef)
+        return None
+
+
+class QueryPlanner:
+    """Choose a search strategy for a filter from its estimated cardinality.
+
+    Filters matching few points are answered by exact search, which Qdrant runs as a
+    brute-force scan over the payload-index subset. Moderately selective filters keep
+    HNSW but raise `ef` in proportion to 1/selectivity so the graph walk still finds
+    `limit` matches. Counts come from approximate count requests, kept in an LRU of
+    `max_entries` filters for `ttl` seconds. A plan costs at most one request for its
+    filter; the collection total is only fetched (and shared by all filters) when the
+    filter is too broad for exact search. `plan_counts` records how often each strategy ran.
+    """
+
+    def __init__(self, client: Any, collection_name: str, exact_threshold: int = PLANNER_EXACT_THRESHOLD,
+                 ttl: float = PLANNER_STATS_TTL, boost_selectivity: float = 0.1, max_ef: int = 512,
+                 max_entries: int = PLANNER_STATS_SIZE):
+        self.client = client
+        self.collection_name = collection_name
+        self.exact_threshold = exact_threshold
+        self.ttl = ttl
+        self.boost_selectivity = boost_selectivity
+        self.max_ef = max_ef
+        self.max_entries = max_entries
+        self.plan_counts: Counter = Counter()
+        self._stats: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def _count(self, query_filter: Optional[Filter]) -> int:
+        key = repr(query_filter)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._stats.get(key)
+            if cached is not None:
+                if now - cached[0] < self.ttl:
+                    self._stats.move_to_end(key)
+                    return cached[1]
+                del self._stats[key]
+        count = self.client.count(collection_name=self.collection_name, count_filter=query_filter, exact=False).count
+        with self._lock:
+            self._stats[key] = (now, count)
+            self._stats.move_to_end(key)
+            # Least recently used first: drop expired entries there, then anything over the size limit
+            while self._stats:
+                stored_at = next(iter(self._stats.values()))[0]
+                if len(self._stats) <= self.max_entries and now - stored_at < self.ttl:
+                    break
+                self._stats.popitem(last=False)
+        return count
+
+    def invalidate(self):
+        """Forget cached counts, e.g. after bulk writes changed the distribution"""
+        with self._lock:
+            self._stats.clear()
+
+    def _choose(self, query_filter: Optional[Filter], limit: int) -> QueryPlan:
+        if query_filter is None:
+            return QueryPlan("hnsw")
+        matches = self._count(query_filter)
+        if matches <= self.exact_threshold:
+            return QueryPlan("exact", matches)
+        total = self._count(None)
+        selectivity = matches / total if total else 0.0
+        if selectivity < self.boost_selectivity:
+            ef = min(self.max_ef, max(64, int(limit / max(selectivity, 1e-9))))
+            return QueryPlan("hnsw_boosted", matches, total, hnsw_ef=ef)
+        return QueryPlan("hnsw", matches, total)
+
+    def _record(self, plans: List[QueryPlan]):
+        with self._lock:
+            self.plan_counts.update(plan.strategy for plan in plans)
+
+    def plan(self, query_filter: Optional[Filter], limit: int) -> QueryPlan:
+        plan = self._choose(query_filter, limit)
+        self._record([plan])
+        return plan
+
+    def plan_many(self, query_filters: List[Optional[Filter]], limit: int) -> List[QueryPlan]:
+        """Plans for a batch of searches, choosing (and counting) each distinct filter once"""
+        chosen: Dict[str, QueryPlan] = {}
+        plans = []
+        for query_filter in query_filters:
+            key = repr(query_filter)
+            if key not in chosen:
+                chosen[key] = self._choose(query_filter, limit)
+            plans.append(chosen[key])
+        self._record(plans)
+        return plans
\ No newline at end of file
@@ -1,84 +1,1018 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, PayloadSchemaType
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Optional
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, PointVectors, SearchRequest, SearchParams, Filter, PayloadSchemaType,
+    HnswConfigDiff, ScalarQuantization, ScalarQuantizationConfig, ScalarType, BinaryQuantization,
+    BinaryQuantizationConfig, QuantizationSearchParams, FieldCondition, MatchAny, MatchValue, Range,
+    NamedSparseVector, SparseVector, SparseVectorParams
+)
+import numpy as np
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import json
+import logging
+import os
+import re
 import uuid
-from config.settings import QDRANT_URL, QDRANT_API_KEY
+from config.settings import (
+    EMBEDDING_MODEL, ENCODER_BACKEND, VECTOR_SIZE, ENCODE_BATCH_SIZE, UPSERT_BATCH_SIZE, SEARCH_BATCH_SIZE,
+    VECTOR_QUANTIZATION, VECTOR_ON_DISK, HNSW_M, HNSW_EF_CONSTRUCT, CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_SEARCH_FACTOR,
+    HYBRID_SEARCH, DETERMINISTIC_IDS, TEXT_STORE_DIR, MMR_OVERSAMPLE, PLANNER_ENABLED
+)
+from src.database.registry import (
+    get_client, get_encoder, get_embedding_cache, get_sparse_encoder, get_result_cache, get_text_store,
+    remove_text_store, get_planner, collection_scope, invalidate_collection, collection_ready, mark_collection_ready
+)
+from src.database.encoders import encoder_name
+from src.database.encode_pool import EncodePool
+from src.database.chunking import (
+    CHUNK_FIELDS, COLLAPSE_MODES, check_chunking, chunk_id, collapse_hits, split_document, strip_chunk_fields
+)
+from src.database.filters import build_filter, FilterSpec
+from src.database.ingest import IngestCheckpoint, document_id
+from src.database.sparse import SPARSE_VECTOR_NAME, fuse
+from src.database.rerank import mmr
+from src.database.planner import QueryPlan
+from src.database.metrics import OperationTimer, get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Payload fields indexed on every collection
+PAYLOAD_INDEXES = [
+    ("sentiment", PayloadSchemaType.KEYWORD),
+    ("rating", PayloadSchemaType.INTEGER),
+    ("category", PayloadSchemaType.KEYWORD),
+    ("source", PayloadSchemaType.KEYWORD),
+    ("parent_id", PayloadSchemaType.KEYWORD)
+]
+
+
+# Payload selection for reads: everything, nothing, or a list of field names
+PayloadSelector = Union[bool, List[str]]
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most `size` items from any iterable"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def collection_options(quantization: Optional[str] = None, on_disk: bool = False, hnsw_m: Optional[int] = None,
+                       hnsw_ef_construct: Optional[int] = None, sparse: bool = False) -> Dict[str, Any]:
+    """Build `create_collection` arguments for the vector storage options.
+
+    `quantization` is None, "scalar" (int8, ~4x smaller) or "binary" (1 bit per dimension).
+    Quantized vectors are kept in RAM; with on_disk=True the float32 originals move to disk
+    and are only read when rescoring. sparse=True adds the BM25 sparse vector for hybrid search.
+    """
+    if quantization == "scalar":
+        quantization_config = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    elif quantization == "binary":
+        quantization_config = BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    elif quantization:
+        raise ValueError(f"Unknown quantization '{quantization}', expected 'scalar' or 'binary'")
+    else:
+        quantization_config = None
+    
+    hnsw_config = None
+    if hnsw_m is not None or hnsw_ef_construct is not None:
+        hnsw_config = HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
+    
+    options = {
+        "vectors_config": VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE, on_disk=on_disk or None),
+        "hnsw_config": hnsw_config,
+        "quantization_config": quantization_config
+    }
+    if sparse:
+        options["sparse_vectors_config"] = {SPARSE_VECTOR_NAME: SparseVectorParams()}
+    return options
+
+
+def missing_payload_indexes(info: Any) -> List[Tuple[str, PayloadSchemaType]]:
+    """PAYLOAD_INDEXES entries not yet in a collection's payload schema (all of them when info is None)"""
+    schema = getattr(info, "payload_schema", None) or {}
+    return [(field_name, schema_type) for field_name, schema_type in PAYLOAD_INDEXES if field_name not in schema]
+
+
+def search_params(base: Optional[SearchParams] = None, hnsw_ef: Optional[int] = None, rescore: Optional[bool] = None,
+                  oversampling: Optional[float] = None) -> Optional[SearchParams]:
+    """Overlay explicit search-time options on the planner's params (explicit values win)"""
+    if base is None and hnsw_ef is None and rescore is None and oversampling is None:
+        return None
+    quantization = None
+    if rescore is not None or oversampling is not None:
+        quantization = QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+    return SearchParams(
+        hnsw_ef=hnsw_ef if hnsw_ef is not None else (base.hnsw_ef if base else None),
+        exact=base.exact if base else None,
+        quantization=quantization
+    )
+
 
 class VectorDB:
-    def __init__(self, collection_name: str = "documents"):
-        self.client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, collection_name: str = "documents", client: Optional[QdrantClient] = None,
+                 model_name: str = EMBEDDING_MODEL, use_cache: bool = True, use_planner: bool = PLANNER_ENABLED,
+                 quantization: Optional[str] = VECTOR_QUANTIZATION or None, on_disk: bool = VECTOR_ON_DISK,
+                 hnsw_m: Optional[int] = HNSW_M, hnsw_ef_construct: Optional[int] = HNSW_EF_CONSTRUCT,
+                 encoder_backend: str = ENCODER_BACKEND, metrics: Optional[Any] = None,
+                 chunk_words: int = CHUNK_WORDS, chunk_overlap: int = CHUNK_OVERLAP, collapse: str = "max",
+                 hybrid: bool = HYBRID_SEARCH, use_result_cache: bool = True,
+                 deterministic_ids: bool = DETERMINISTIC_IDS, auto_setup: bool = True,
+                 text_store: Optional[str] = TEXT_STORE_DIR or None):
+        # Client and encoder are shared process-wide; a VectorDB is a light handle on one collection
+        self.client = client if client is not None else get_client()
+        self.model_name = model_name
+        self.encoder_backend = encoder_backend
+        self.encoder_name = encoder_name(model_name, encoder_backend)
+        self.use_cache = use_cache
         self.collection_name = collection_name
-        self._setup_collection()
+        self.planner = get_planner(self.client, collection_name) if use_planner else None
+        self.result_cache = get_result_cache() if use_result_cache else None
+        # Result cache entries, generations and planner stats are per endpoint and collection
+        self._cache_scope = collection_scope(self.client, collection_name)
+        self.last_plan: Optional[QueryPlan] = None
+        self.deterministic_ids = deterministic_ids
+        self.hybrid = hybrid
+        self.options = collection_options(quantization, on_disk, hnsw_m, hnsw_ef_construct, sparse=hybrid)
+        self._metrics = metrics
+        # With chunk_words > 0 documents become one point per window (see src.database.chunking)
+        if collapse not in COLLAPSE_MODES:
+            raise ValueError(f"Unknown collapse mode '{collapse}', expected one of {COLLAPSE_MODES}")
+        check_chunking(chunk_words, chunk_overlap)
+        self.chunk_words = chunk_words
+        self.chunk_overlap = chunk_overlap
+        self.collapse = collapse
+        # With a text store directory, document text lives in a local TextStore instead of the payload
+        self.text_store_path = (os.path.join(text_store, re.sub(r"[^A-Za-z0-9_.-]", "_", collection_name))
+                                if text_store else None)
+        # Handle settings that change search results: handles on one collection share cached results
+        # (and compare query embeddings) only when they agree on all of them
+        self._cache_settings = (self.encoder_name, chunk_words, chunk_overlap, collapse, hybrid, self.text_store_path)
+        # Nothing above touches the network or loads a model; the collection is set up by
+        # `setup()`, which the first operation runs unless auto_setup=False
+        self.auto_setup = auto_setup
+    
+    @property
+    def encoder(self):
+        return get_encoder(self.model_name, self.encoder_backend)
+    
+    @property
+    def cache(self):
+        return get_embedding_cache(self.encoder_name) if self.use_cache else None
+    
+    @property
+    def sparse_encoder(self):
+        return get_sparse_encoder() if self.hybrid else None
+    
+    @property
+    def text_store(self):
+        return get_text_store(self.text_store_path) if self.text_store_path else None
     
-    def _setup_collection(self):
+    @property
+    def metrics(self):
+        """Metrics sink for this handle; defaults to the process-wide registry"""
+        return self._metrics if self._metrics is not None else get_metrics()
+    
+    def _operation(self, name: str) -> OperationTimer:
+        if self.auto_setup:
+            self.setup()
+        return OperationTimer(self.metrics, name, self.collection_name)
+    
+    def _record_batch(self, operation: str, points: int, payloads: Iterable[Dict[str, Any]] = ()):
+        if not getattr(self.metrics, "enabled", True):
+            # Serializing payloads only to count their bytes is not worth it on a null sink
+            return
+        self.metrics.observe("vectordb_batch_size", points, operation=operation, collection=self.collection_name)
+        payload_bytes = sum(len(json.dumps(payload, default=str)) for payload in payloads)
+        if payload_bytes:
+            self.metrics.observe("vectordb_payload_bytes", payload_bytes, operation=operation,
+                                 collection=self.collection_name)
+    
+    def _encode(self, texts: List[str], batch_size: int = ENCODE_BATCH_SIZE, encoder: Any = None) -> np.ndarray:
+        """Embed texts, reusing cached vectors and only running the model on misses"""
+        encoder = encoder if encoder is not None else self.encoder
+        encode_fn = lambda batch: encoder.encode(batch, batch_size=batch_size)
+        if self.cache is not None:
+            return self.cache.encode(texts, encode_fn)
+        return encode_fn(texts)
+    
+    def _embed(self, texts: List[str], batch_size: int = ENCODE_BATCH_SIZE, encoder: Any = None) -> List[Any]:
+        """Point vectors for texts: the dense embedding, plus the BM25 vector in hybrid collections"""
+        dense = self._encode(texts, batch_size=batch_size, encoder=encoder)
+        if not self.hybrid:
+            return [vector.tolist() for vector in dense]
+        sparse = self.sparse_encoder.encode_documents(texts)
+        return [{"": vector.tolist(), SPARSE_VECTOR_NAME: sparse_vector} for vector, sparse_vector in zip(dense, sparse)]
+    
+    def _collection_info(self) -> Any:
         try:
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(size=384, distance=Distance.COSINE)
-            )
-        except:
-            pass
-        
-        # Create indexes
-        indexes = [
-            ("sentiment", PayloadSchemaType.KEYWORD),
-            ("rating", PayloadSchemaType.INTEGER),
-            ("category", PayloadSchemaType.KEYWORD),
-            ("source", PayloadSchemaType.KEYWORD)
-        ]
-        
-        for field_name, schema_type in indexes:
+            return self.client.get_collection(self.collection_name)
+        except Exception:
+            return None
+    
+    def setup(self) -> bool:
+        """Create the collection and any missing payload indexes; safe to call repeatedly.
+
+        One collection-info request decides what is missing. The outcome is remembered
+        per client for the whole process, so later calls (and other handles on the same
+        collection) make no requests. Returns True if anything was created.
+        """
+        if collection_ready(self.client, self.collection_name):
+            return False
+        
+        created = False
+        info = self._collection_info()
+        if info is None:
             try:
-                self.client.create_payload_index(
-                    collection_name=self.collection_name,
-                    field_name=field_name,
-                    field_schema=schema_type
-                )
-            except:
-                pass
+                self.client.create_collection(collection_name=self.collection_name, **self.options)
+                created = True
+            except Exception:
+                # Lost a race with another process creating it; anything else is a real error
+                if self._collection_info() is None:
+                    raise
+        
+        for field_name, schema_type in missing_payload_indexes(info):
+            try:
+                self.client.create_payload_index(collection_name=self.collection_name, field_name=field_name,
+                                                 field_schema=schema_type)
+                created = True
+            except Exception as e:
+                # Indexes only speed up filtering, so a failure must not block the collection
+                logger.warning("create_payload_index(%s.%s) failed: %s", self.collection_name, field_name, e)
+                self.metrics.increment("vectordb_setup_errors_total", step="create_payload_index",
+                                       collection=self.collection_name)
+        
+        mark_collection_ready(self.client, self.collection_name)
+        return created
+    
+    def drop(self) -> bool:
+        """Delete the collection and its text store; the next operation (or `setup()`) creates it afresh"""
+        mark_collection_ready(self.client, self.collection_name, False)
+        self._invalidate()
+        dropped = self.client.delete_collection(collection_name=self.collection_name)
+        if self.text_store_path:
+            remove_text_store(self.text_store_path)
+        return dropped
+    
+    def _write_batch(self, op: OperationTimer, points: List[PointStruct], checkpoint: Optional[IngestCheckpoint],
+                     batch: int, batch_ids: List[str]):
+        if points:
+            with op.phase("server"):
+                self.client.upsert(collection_name=self.collection_name, points=points)
+                if self.chunk_words:
+                    self._delete_stale_chunks(points)
+        if checkpoint is not None:
+            checkpoint.mark_done(batch, batch_ids)
+    
+    def _document_id(self, doc: Dict[str, Any]) -> str:
+        return document_id(doc) if self.deterministic_ids else str(uuid.uuid4())
+    
+    def _existing(self, doc_ids: List[str]) -> set:
+        """The subset of `doc_ids` already stored, from one bulk retrieve without payloads"""
+        point_ids = {chunk_id(doc_id, 0) if self.chunk_words else doc_id: doc_id for doc_id in doc_ids}
+        records = self.client.retrieve(collection_name=self.collection_name, ids=list(point_ids),
+                                       with_payload=False, with_vectors=False)
+        return {point_ids[str(record.id)] for record in records if str(record.id) in point_ids}
+    
+    def _prepare_batches(self, op: OperationTimer, documents: Iterable[Dict[str, Any]], batch_size: int,
+                         skip_existing: bool, checkpoint: Optional[IngestCheckpoint], ids: List[str]) -> Iterator[Tuple]:
+        """Yield (batch number, batch ids, [(id, doc)] to store, points to embed) per chunk of documents"""
+        for batch, chunk in enumerate(_chunked(documents, batch_size)):
+            batch_ids = [self._document_id(doc) for doc in chunk]
+            ids.extend(batch_ids)
+            if checkpoint is not None and checkpoint.is_done(batch, batch_ids):
+                op.details["skipped_batches"] += 1
+                continue
+            
+            todo = list(zip(batch_ids, chunk))
+            if skip_existing:
+                with op.phase("server"):
+                    existing = self._existing(batch_ids)
+                todo = [(doc_id, doc) for doc_id, doc in todo if doc_id not in existing]
+                op.details["skipped_points"] += len(chunk) - len(todo)
+            
+            with op.phase("serialize"):
+                units = [unit for doc_id, doc in todo for unit in self._split(doc_id, doc)]
+                self._store_texts(todo)
+            yield batch, batch_ids, todo, units
     
-    def insert(self, documents: List[Dict[str, Any]]) -> List[str]:
-        points = []
+    def _embed_batches(self, op: OperationTimer, batches: Iterator[Tuple], batch_size: int,
+                       encode_pool: Optional[EncodePool]) -> Iterator[Tuple[Tuple, List[Any]]]:
+        """Yield (batch, point vectors) in input order.
+
+        With an encode pool, up to two batches per worker are embedded concurrently so no
+        worker idles while the parent serializes and upserts.
+        """
+        def embed(units):
+            return self._embed([text for _, _, text in units], batch_size=batch_size, encoder=encode_pool) if units else []
+        
+        if encode_pool is None:
+            for item in batches:
+                with op.phase("encode"):
+                    vectors = embed(item[-1])
+                yield item, vectors
+            return
+        
+        with ThreadPoolExecutor(max_workers=encode_pool.workers, thread_name_prefix="encode-pool") as executor:
+            window = deque()
+            for item in batches:
+                window.append((item, executor.submit(embed, item[-1])))
+                if len(window) < 2 * encode_pool.workers:
+                    continue
+                item, future = window.popleft()
+                with op.phase("encode"):
+                    vectors = future.result()
+                yield item, vectors
+            while window:
+                item, future = window.popleft()
+                with op.phase("encode"):
+                    vectors = future.result()
+                yield item, vectors
+    
+    def insert(self, documents: Iterable[Dict[str, Any]], batch_size: int = UPSERT_BATCH_SIZE,
+               encode_batch_size: int = ENCODE_BATCH_SIZE, skip_existing: bool = False,
+               checkpoint: Optional[str] = None, encode_pool: Optional[EncodePool] = None) -> List[str]:
+        """Encode and upsert documents in bounded chunks.
+
+        Each chunk is embedded with a single batched encoder call; the upsert of
+        chunk N runs on a background thread while chunk N+1 is being encoded.
+        Passing an `EncodePool` spreads the encoding of several chunks over its
+        worker processes, still feeding the one upsert writer in order.
+
+        Ids are derived from each document's source or text (see `document_id`), so
+        re-inserting updates points instead of duplicating them. skip_existing=True
+        checks each chunk's ids in bulk and only embeds documents not yet stored, and
+        `checkpoint` names a file recording finished chunks so a re-run of an interrupted
+        load skips straight past them. Returns the ids of all documents, skipped ones included.
+        """
+        if (skip_existing or checkpoint) and not self.deterministic_ids:
+            raise ValueError("skip_existing and checkpoint need deterministic_ids=True")
+        if encode_pool is not None and encode_pool.encoder_name != self.encoder_name:
+            raise ValueError(f"Encode pool runs '{encode_pool.encoder_name}' but collection "
+                             f"'{self.collection_name}' uses '{self.encoder_name}'")
+        progress = IngestCheckpoint(checkpoint) if checkpoint else None
+        
         ids = []
-        for doc in documents:
-            doc_id = str(uuid.uuid4())
-            vector = self.encoder.encode(doc['text']).tolist()
-            points.append(PointStruct(id=doc_id, vector=vector, payload=doc))
-            ids.append(doc_id)
+        with self._operation("insert") as op, ThreadPoolExecutor(max_workers=1) as writer:
+            pending = None
+            op.details.update(skipped_batches=0, skipped_points=0)
+            batches = self._prepare_batches(op, documents, batch_size, skip_existing, progress, ids)
+            for (batch, batch_ids, todo, units), vectors in self._embed_batches(op, batches, encode_batch_size,
+                                                                               encode_pool):
+                with op.phase("serialize"):
+                    points = [PointStruct(id=point_id, vector=vector, payload=payload)
+                              for (point_id, payload, _), vector in zip(units, vectors)]
+                    if points:
+                        self._record_batch("insert", len(points), [doc for _, doc in todo])
+                
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(self._write_batch, op, points, progress, batch, batch_ids)
+            
+            if pending is not None:
+                pending.result()
+            op.details["points"] = len(ids)
         
-        self.client.upsert(collection_name=self.collection_name, points=points)
+        self._invalidate()
         return ids
     
-    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
-        vector = self.encoder.encode(query).tolist()
-        
-        query_filter = None
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
-            query_filter = Filter(must=conditions)
-        
-        results = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=vector,
-            query_filter=query_filter,
-            limit=limit
-        )
-        return [{"id": r.id, "score": r.score, "data": r.payload} for r in results]
+    def _invalidate(self):
+        """Drop planner statistics and cached search results after a write"""
+        invalidate_collection(self._cache_scope)
+    
+    def _split(self, doc_id: str, doc: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any], str]]:
+        """(point id, payload, text to embed) for every point a document is stored as"""
+        if not self.chunk_words:
+            units = [(doc_id, doc, doc['text'])]
+        else:
+            units = [(point_id, payload, payload["chunk_text"])
+                     for point_id, payload in split_document(doc_id, doc, self.chunk_words, self.chunk_overlap)]
+        if self.text_store_path:
+            # The full text goes to the text store (see _store_texts), not the payload
+            units = [(point_id, {key: value for key, value in payload.items() if key != 'text'}, text)
+                     for point_id, payload, text in units]
+        return units
+    
+    def _store_texts(self, docs: List[Tuple[str, Dict[str, Any]]]):
+        if self.text_store_path and docs:
+            self.text_store.put_many((doc_id, doc['text']) for doc_id, doc in docs)
+    
+    @staticmethod
+    def _parent_filter(doc_ids: List[str]) -> Filter:
+        return Filter(must=[FieldCondition(key="parent_id", match=MatchAny(any=[str(i) for i in doc_ids]))])
+    
+    def _fetch_limit(self, limit: int) -> int:
+        # Several chunks of one review can crowd the top hits, so fetch more before collapsing
+        return limit * CHUNK_SEARCH_FACTOR if self.chunk_words else limit
+    
+    def _selector(self, with_payload: PayloadSelector) -> PayloadSelector:
+        """The payload selector sent to Qdrant: chunked collections always need their chunk fields,
+        except the window text, which is only fetched when the caller asks for text"""
+        if not self.chunk_words or with_payload is True:
+            return with_payload
+        fields = [field for field in CHUNK_FIELDS if field != "chunk_text" or self._wants_text(with_payload)]
+        return fields + list(with_payload or [])
     
-    def get(self, doc_id: str) -> Dict:
-        result = self.client.retrieve(collection_name=self.collection_name, ids=[doc_id])
-        return {"id": result[0].id, "data": result[0].payload} if result else None
+    def _data(self, payload: Optional[Dict[str, Any]], with_payload: PayloadSelector) -> Dict[str, Any]:
+        """A stored payload projected onto `with_payload`"""
+        if self.chunk_words:
+            payload = strip_chunk_fields(payload)
+        if with_payload is True:
+            return payload
+        if not with_payload:
+            return {}
+        return {key: value for key, value in (payload or {}).items() if key in with_payload}
     
-    def update(self, doc_id: str, data: Dict[str, Any]) -> bool:
-        vector = self.encoder.encode(data['text']).tolist()
-        point = PointStruct(id=doc_id, vector=vector, payload=data)
-        self.client.upsert(collection_name=self.collection_name, points=[point])
+    @staticmethod
+    def _wants_text(with_payload: PayloadSelector) -> bool:
+        return with_payload is True or bool(with_payload) and 'text' in with_payload
+    
+    def _item(self, doc_id: Any, record: Any, with_payload: PayloadSelector, with_vectors: bool) -> Dict[str, Any]:
+        item = {"id": doc_id, "data": self._data(record.payload, with_payload)}
+        if with_vectors:
+            item["vector"] = self._dense(record.vector)
+        return item
+    
+    def _attach_texts(self, items: List[Dict], with_payload: PayloadSelector) -> List[Dict]:
+        """Fill in `text` from the text store, for results that asked for it"""
+        if self.text_store_path and items and self._wants_text(with_payload):
+            texts = self.text_store.get_many(item["id"] for item in items)
+            for item in items:
+                text = texts.get(str(item["id"]))
+                if text is not None:
+                    item["data"]["text"] = text
+        return items
+    
+    def _results(self, hits: List[Any], limit: int, with_payload: PayloadSelector = True,
+                 with_vectors: bool = False) -> List[Dict]:
+        """Turn search hits into results, collapsing chunk hits into one result per document"""
+        if not self.chunk_words:
+            results = []
+            for hit in hits:
+                result = {"id": hit.id, "score": hit.score, "data": self._data(hit.payload, with_payload)}
+                if with_vectors:
+                    result["vector"] = self._dense(hit.vector)
+                results.append(result)
+            return self._attach_texts(results, with_payload)
+        
+        groups = collapse_hits(hits, limit, self.collapse)
+        heads = {}
+        if self._wants_text(with_payload) and not self.text_store_path:
+            # Every chunk carries the metadata, but only head chunks the full text
+            heads = {parent_id: group[0].payload for parent_id, _, group in groups
+                     if group[0].payload.get("chunk_index", 0) == 0}
+            missing = [chunk_id(parent_id, 0) for parent_id, _, _ in groups if parent_id not in heads]
+            if missing:
+                for record in self.client.retrieve(collection_name=self.collection_name, ids=missing,
+                                                   with_payload=self._selector(with_payload)):
+                    heads[record.payload["parent_id"]] = record.payload
+        
+        results = []
+        for parent_id, score, group in groups:
+            result = {"id": parent_id, "score": score,
+                      "data": self._data(heads.get(parent_id, group[0].payload), with_payload),
+                      "chunk": group[0].payload.get("chunk_text")}
+            if with_vectors:
+                # The best-matching chunk's embedding
+                result["vector"] = self._dense(group[0].vector)
+            results.append(result)
+        return self._attach_texts(results, with_payload)
+    
+    @staticmethod
+    def _build_filter(filters: FilterSpec) -> Optional[Filter]:
+        """Compile a filters dict (see `src.database.filters.build_filter`) against the collection's indexes"""
+        return build_filter(filters, dict(PAYLOAD_INDEXES))
+    
+    def _plan(self, query_filter: Optional[Filter], limit: int) -> Optional[QueryPlan]:
+        if self.planner is None:
+            return None
+        self.last_plan = self.planner.plan(query_filter, limit)
+        return self.last_plan
+    
+    def _plan_many(self, query_filters: List[Optional[Filter]], limit: int) -> List[Optional[QueryPlan]]:
+        if self.planner is None:
+            return [None] * len(query_filters)
+        plans = self.planner.plan_many(query_filters, limit)
+        if plans:
+            self.last_plan = plans[-1]
+        return plans
+    
+    @staticmethod
+    def _as_result(point, with_vectors: bool = False) -> Dict:
+        result = {"id": point.id, "score": point.score, "data": point.payload or {}}
+        if with_vectors:
+            result["vector"] = VectorDB._dense(point.vector)
+        return result
+    
+    def search(self, query: str, limit: int = 5, filters: FilterSpec = None, hnsw_ef: Optional[int] = None,
+               rescore: Optional[bool] = None, oversampling: Optional[float] = None, hybrid: Optional[bool] = None,
+               fusion: str = "rrf", alpha: float = 0.5, with_payload: PayloadSelector = True,
+               with_vectors: bool = False, mmr_lambda: Optional[float] = None,
+               mmr_oversample: int = MMR_OVERSAMPLE) -> List[Dict]:
+        """Semantic search; `rescore`/`oversampling` tune quantized search, `hnsw_ef` the graph walk.
+
+        In hybrid collections the query also runs against the BM25 vectors (disable with
+        hybrid=False) and both rankings are merged with `fusion` ("rrf" or "weighted", where
+        `alpha` weighs the dense side); scores are then fusion scores, not cosine similarities.
+
+        `with_payload` is True, False or a list of payload fields to return in "data";
+        with_vectors=True adds each result's dense "vector". With `mmr_lambda` (0-1, lower
+        is more diverse), `limit * mmr_oversample` candidates are re-ranked by maximal
+        marginal relevance to drop near-duplicates.
+        """
+        with self._operation("search") as op:
+            op.details["query"] = query
+            cache = self.result_cache
+            if cache is not None:
+                signature = cache.signature(self._cache_scope, filters, limit, hnsw_ef=hnsw_ef, rescore=rescore,
+                                            oversampling=oversampling, hybrid=hybrid, fusion=fusion, alpha=alpha,
+                                            with_payload=tuple(with_payload) if isinstance(with_payload, list)
+                                            else with_payload, with_vectors=with_vectors, mmr_lambda=mmr_lambda,
+                                            mmr_oversample=mmr_oversample, handle=self._cache_settings)
+                key = cache.key(signature, query)
+                # Read before searching: a write that lands mid-search leaves the stored entry stale
+                generation = cache.generation(self._cache_scope)
+                cached = cache.get(key)
+                if cached is not None:
+                    return self._cached(op, "hit", cached)
+            
+            with op.phase("encode"):
+                vector = self._encode([query])[0]
+                sparse_vector = self._sparse_query(query, hybrid)
+            if cache is not None:
+                similar = cache.get_similar(signature, vector)
+                if similar is not None:
+                    return self._cached(op, "near", similar)
+            
+            if mmr_lambda is None:
+                results = self._search_vector(op, vector, limit, filters, None, hnsw_ef, rescore, oversampling,
+                                              sparse_vector, fusion, alpha, with_payload, with_vectors)
+            else:
+                candidates = self._search_vector(op, vector, limit * mmr_oversample, filters, None, hnsw_ef, rescore,
+                                                 oversampling, sparse_vector, fusion, alpha, with_payload, True)
+                with op.phase("rerank"):
+                    results = self._diversify(candidates, limit, mmr_lambda, with_vectors, vector)
+            if cache is not None:
+                cache.put(key, results, generation, vector)
+                self.metrics.increment("vectordb_result_cache_total", result="miss", collection=self.collection_name)
+            return results
+    
+    @staticmethod
+    def _diversify(results: List[Dict], limit: int, mmr_lambda: float, with_vectors: bool,
+                   query: Optional[Union[np.ndarray, List[float]]] = None) -> List[Dict]:
+        """Re-rank candidates (with vectors) by MMR; relevance is cosine to `query`, else the result score"""
+        if not results:
+            return results
+        vectors = np.asarray([result["vector"] for result in results], dtype=np.float32)
+        if query is not None:
+            query = np.asarray(query, dtype=np.float32)
+            relevance = vectors @ query / np.maximum(np.linalg.norm(vectors, axis=1) * np.linalg.norm(query), 1e-12)
+        else:
+            relevance = [result["score"] for result in results]
+        picked = [results[i] for i in mmr(vectors, relevance, limit, mmr_lambda)]
+        if not with_vectors:
+            for result in picked:
+                del result["vector"]
+        return picked
+    
+    def recommend(self, positive_ids: List[str], negative_ids: Optional[List[str]] = None, filters: FilterSpec = None,
+                  limit: int = 5, hnsw_ef: Optional[int] = None, with_payload: PayloadSelector = True,
+                  with_vectors: bool = False, mmr_lambda: Optional[float] = None,
+                  mmr_oversample: int = MMR_OVERSAMPLE) -> List[Dict]:
+        """Documents similar to `positive_ids` and unlike `negative_ids`, from their stored vectors.
+
+        Uses Qdrant's recommend API (average vector strategy), so nothing is re-encoded; the
+        example documents themselves are never returned. Other options behave as in `search`.
+        """
+        negative_ids = list(negative_ids or [])
+        examples = list(positive_ids) + negative_ids
+        with self._operation("recommend") as op:
+            with op.phase("serialize"):
+                query_filter = self._build_filter(filters)
+                if self.chunk_words:
+                    # Examples are given by their head chunks; keep their other windows out of the results
+                    others = Filter(must_not=[FieldCondition(key="parent_id",
+                                                             match=MatchAny(any=[str(i) for i in examples]))])
+                    query_filter = Filter(must=[query_filter, others]) if query_filter is not None else others
+                    to_point = lambda doc_id: chunk_id(doc_id, 0)
+                else:
+                    to_point = lambda doc_id: doc_id
+            candidates = limit * mmr_oversample if mmr_lambda is not None else limit
+            fetch_limit = self._fetch_limit(candidates)
+            with op.phase("plan"):
+                plan = self._plan(query_filter, fetch_limit)
+            op.details.update(positive=len(positive_ids), negative=len(negative_ids), filters=filters, limit=limit,
+                              plan=plan)
+            with op.phase("server"):
+                hits = self.client.recommend(
+                    collection_name=self.collection_name,
+                    positive=[to_point(doc_id) for doc_id in positive_ids],
+                    negative=[to_point(doc_id) for doc_id in negative_ids],
+                    query_filter=query_filter,
+                    search_params=search_params(plan.search_params if plan else None, hnsw_ef),
+                    limit=fetch_limit,
+                    with_payload=self._selector(with_payload),
+                    with_vectors=with_vectors or mmr_lambda is not None
+                )
+                results = self._results(hits, candidates, with_payload, with_vectors or mmr_lambda is not None)
+            if mmr_lambda is not None:
+                with op.phase("rerank"):
+                    results = self._diversify(results, limit, mmr_lambda, with_vectors)
+            return results
+    
+    def _cached(self, op: OperationTimer, result: str, results: List[Dict]) -> List[Dict]:
+        op.details["cache"] = result
+        self.metrics.increment("vectordb_result_cache_total", result=result, collection=self.collection_name)
+        return results
+    
+    def search_vector(self, vector: Union[np.ndarray, List[float]], limit: int = 5,
+                      filters: FilterSpec = None, timeout: Optional[int] = None, hnsw_ef: Optional[int] = None,
+                      rescore: Optional[bool] = None, oversampling: Optional[float] = None,
+                      with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[Dict]:
+        """Search with an already computed query embedding"""
+        with self._operation("search_vector") as op:
+            return self._search_vector(op, vector, limit, filters, timeout, hnsw_ef, rescore, oversampling,
+                                       with_payload=with_payload, with_vectors=with_vectors)
+    
+    def _sparse_query(self, query: str, hybrid: Optional[bool]) -> Optional[SparseVector]:
+        if hybrid is None:
+            hybrid = self.hybrid
+        if not hybrid:
+            return None
+        if not self.hybrid:
+            raise ValueError(f"Collection '{self.collection_name}' was not opened with hybrid=True")
+        return self.sparse_encoder.encode_queries([query])[0]
+    
+    @staticmethod
+    def _requests(vector: Union[np.ndarray, List[float]], sparse_vector: Optional[SparseVector],
+                  query_filter: Optional[Filter], limit: int, params: Optional[SearchParams],
+                  with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[SearchRequest]:
+        """The dense search request, followed by the BM25 one for hybrid queries"""
+        requests = [SearchRequest(vector=np.asarray(vector).tolist(), filter=query_filter, limit=limit,
+                                  with_payload=with_payload, with_vector=with_vectors, params=params)]
+        if sparse_vector is not None:
+            requests.append(SearchRequest(vector=NamedSparseVector(name=SPARSE_VECTOR_NAME, vector=sparse_vector),
+                                          filter=query_filter, limit=limit, with_payload=with_payload,
+                                          with_vector=with_vectors))
+        return requests
+    
+    def _search_vector(self, op: OperationTimer, vector: Union[np.ndarray, List[float]], limit: int,
+                       filters: FilterSpec, timeout: Optional[int], hnsw_ef: Optional[int],
+                       rescore: Optional[bool], oversampling: Optional[float],
+                       sparse_vector: Optional[SparseVector] = None, fusion: str = "rrf",
+                       alpha: float = 0.5, with_payload: PayloadSelector = True,
+                       with_vectors: bool = False) -> List[Dict]:
+        with op.phase("serialize"):
+            query_filter = self._build_filter(filters)
+            query_vector = np.asarray(vector).tolist()
+        fetch_limit = self._fetch_limit(limit)
+        with op.phase("plan"):
+            plan = self._plan(query_filter, fetch_limit)
+        op.details.update(filters=filters, limit=limit, plan=plan)
+        params = search_params(plan.search_params if plan else None, hnsw_ef, rescore, oversampling)
+        
+        if sparse_vector is not None:
+            # Dense and sparse legs go out in one batch request and are fused here
+            requests = self._requests(query_vector, sparse_vector, query_filter, fetch_limit, params,
+                                      self._selector(with_payload), with_vectors)
+            with op.phase("server"):
+                dense, sparse = self.client.search_batch(collection_name=self.collection_name, requests=requests,
+                                                         timeout=timeout)
+                return self._results(fuse(dense, sparse, fusion, alpha)[:fetch_limit], limit, with_payload,
+                                     with_vectors)
+        
+        with op.phase("server"):
+            results = self.client.search(
+                collection_name=self.collection_name,
+                query_vector=query_vector,
+                query_filter=query_filter,
+                search_params=params,
+                limit=fetch_limit,
+                timeout=timeout,
+                with_payload=self._selector(with_payload),
+                with_vectors=with_vectors
+            )
+            return self._results(results, limit, with_payload, with_vectors)
+    
+    def search_many(self, queries: List[str], limit: int = 5,
+                    filters: Union[FilterSpec, List[FilterSpec]] = None,
+                    batch_size: int = SEARCH_BATCH_SIZE, hnsw_ef: Optional[int] = None,
+                    rescore: Optional[bool] = None, oversampling: Optional[float] = None,
+                    hybrid: Optional[bool] = None, fusion: str = "rrf", alpha: float = 0.5,
+                    with_payload: PayloadSelector = True, with_vectors: bool = False) -> List[List[Dict]]:
+        """Run many searches with batched encoding and Qdrant batch search requests.
+
+        `filters` is either one filters dict applied to every query or a list aligned
+        with `queries`. Results are returned in the same order as `queries`. Hybrid and
+        projection options behave as in `search`.
+        """
+        if not isinstance(filters, list):
+            filters = [filters] * len(queries)
+        if len(filters) != len(queries):
+            raise ValueError("filters must be a dict or a list with one entry per query")
+        
+        with self._operation("search_many") as op:
+            op.details.update(queries=len(queries), limit=limit)
+            with op.phase("encode"):
+                vectors = self._encode(list(queries))
+                sparse_vectors = [self._sparse_query(query, hybrid) for query in queries]
+            fetch_limit = self._fetch_limit(limit)
+            with op.phase("serialize"):
+                query_filters = [self._build_filter(query_filter) for query_filter in filters]
+            with op.phase("plan"):
+                # One pass over the distinct filters, so a batch never pays a count per query
+                plans = self._plan_many(query_filters, fetch_limit)
+            requests = []
+            with op.phase("serialize"):
+                for vector, sparse_vector, query_filter, plan in zip(vectors, sparse_vectors, query_filters, plans):
+                    params = search_params(plan.search_params if plan else None, hnsw_ef, rescore, oversampling)
+                    requests.append(self._requests(vector, sparse_vector, query_filter, fetch_limit, params,
+                                                   self._selector(with_payload), with_vectors))
+            
+            all_results = []
+            for chunk in _chunked(requests, batch_size):
+                self._record_batch("search_many", len(chunk))
+                with op.phase("server"):
+                    batch = iter(self.client.search_batch(
+                        collection_name=self.collection_name,
+                        requests=[request for query_requests in chunk for request in query_requests]
+                    ))
+                    for query_requests in chunk:
+                        hits = next(batch)
+                        if len(query_requests) > 1:
+                            hits = fuse(hits, next(batch), fusion, alpha)[:fetch_limit]
+                        all_results.append(self._results(hits, limit, with_payload, with_vectors))
+            return all_results
+    
+    def get(self, doc_id: str, with_payload: PayloadSelector = True, with_vectors: bool = False) -> Dict:
+        point_id = chunk_id(doc_id, 0) if self.chunk_words else doc_id
+        with self._operation("get") as op, op.phase("server"):
+            result = self.client.retrieve(collection_name=self.collection_name, ids=[point_id],
+                                          with_payload=self._selector(with_payload), with_vectors=with_vectors)
+        if not result:
+            return None
+        return self._attach_texts([self._item(doc_id, result[0], with_payload, with_vectors)], with_payload)[0]
+    
+    def get_many(self, doc_ids: List[str], batch_size: int = UPSERT_BATCH_SIZE, with_payload: PayloadSelector = True,
+                 with_vectors: bool = False) -> List[Dict]:
+        """Fetch many documents with one retrieve per `batch_size` ids; missing ids are left out"""
+        point_ids = [chunk_id(doc_id, 0) if self.chunk_words else doc_id for doc_id in doc_ids]
+        found = {}
+        with self._operation("get_many") as op:
+            for chunk in _chunked(point_ids, batch_size):
+                with op.phase("server"):
+                    for record in self.client.retrieve(collection_name=self.collection_name, ids=chunk,
+                                                       with_payload=self._selector(with_payload),
+                                                       with_vectors=with_vectors):
+                        found[str(record.id)] = record
+        items = [self._item(doc_id, found[str(point_id)], with_payload, with_vectors)
+                 for doc_id, point_id in zip(doc_ids, point_ids) if str(point_id) in found]
+        return self._attach_texts(items, with_payload)
+    
+    def _scroll_filter(self, filters: FilterSpec) -> Optional[Filter]:
+        query_filter = self._build_filter(filters)
+        if not self.chunk_words:
+            return query_filter
+        # One record per document: head chunks, plus any points stored unchunked
+        heads = Filter(must_not=[FieldCondition(key="chunk_index", range=Range(gt=0))])
+        return Filter(must=[query_filter, heads]) if query_filter is not None else heads
+    
+    @staticmethod
+    def _dense(vector: Any) -> Optional[List[float]]:
+        # Hybrid collections return {"": dense, "bm25": sparse}
+        return vector.get("") if isinstance(vector, dict) else vector
+    
+    def scroll(self, filters: FilterSpec = None, batch_size: int = UPSERT_BATCH_SIZE,
+               with_vectors: bool = False, with_payload: PayloadSelector = True) -> Iterator[Dict]:
+        """Lazily yield every document matching `filters`, fetching `batch_size` points per request.
+
+        Items are {"id", "data"} plus "vector" (the dense embedding) with with_vectors=True;
+        `with_payload` selects the fields of "data" as in `search`.
+        """
+        scroll_filter = self._scroll_filter(filters)
+        offset = None
+        while True:
+            with self._operation("scroll") as op, op.phase("server"):
+                page, offset = self.client.scroll(collection_name=self.collection_name, scroll_filter=scroll_filter,
+                                                  limit=batch_size, offset=offset,
+                                                  with_payload=self._selector(with_payload),
+                                                  with_vectors=with_vectors)
+            items = [self._item((record.payload or {}).get("parent_id", record.id) if self.chunk_words else record.id,
+                                record, with_payload, with_vectors)
+                     for record in page]
+            yield from self._attach_texts(items, with_payload)
+            if offset is None:
+                return
+    
+    def export(self, directory: str, filters: FilterSpec = None, batch_size: int = 1000) -> Dict[str, Any]:
+        """Stream matching documents to `directory` as vectors.npy plus row-aligned payloads.jsonl.
+
+        Vectors are written through a memory-mapped .npy, so memory use is bounded by
+        `batch_size` whatever the collection size; read back with np.load(path, mmap_mode="r").
+        Points inserted after the export started are not included.
+        """
+        os.makedirs(directory, exist_ok=True)
+        vectors_path = os.path.join(directory, "vectors.npy")
+        payloads_path = os.path.join(directory, "payloads.jsonl")
+        with self._operation("export") as op, op.phase("server"):
+            total = self.client.count(collection_name=self.collection_name,
+                                      count_filter=self._scroll_filter(filters), exact=True).count
+        
+        vectors = np.lib.format.open_memmap(vectors_path, mode="w+", dtype=np.float32, shape=(total, VECTOR_SIZE))
+        rows = 0
+        with open(payloads_path, "w", encoding="utf-8") as f:
+            for item in self.scroll(filters, batch_size=batch_size, with_vectors=True):
+                if rows == total:
+                    break
+                vectors[rows] = item["vector"]
+                f.write(json.dumps({"id": item["id"], "data": item["data"]}, default=str) + "\n")
+                rows += 1
+        vectors.flush()
+        del vectors
+        
+        if rows < total:
+            # Points were deleted mid-export: shrink the file so rows stay aligned with payloads.jsonl
+            source = np.load(vectors_path, mmap_mode="r")
+            trimmed = np.lib.format.open_memmap(vectors_path + ".tmp", mode="w+", dtype=np.float32,
+                                                shape=(rows, VECTOR_SIZE))
+            for start in range(0, rows, batch_size):
+                trimmed[start:start + batch_size] = source[start:start + batch_size]
+            trimmed.flush()
+            del trimmed, source
+            os.replace(vectors_path + ".tmp", vectors_path)
+        return {"points": rows, "vectors": vectors_path, "payloads": payloads_path}
+    
+    def update(self, doc_id: str, data: Dict[str, Any], partial: bool = False, wait: bool = True) -> bool:
+        """Replace a document, or with partial=True merge `data` into its payload"""
+        if partial:
+            return self.update_payload([doc_id], data)
+        return self.update_many({doc_id: data}, wait=wait)
+    
+    def update_many(self, documents: Dict[str, Dict[str, Any]], wait: bool = True) -> bool:
+        """Replace many documents (id -> document) with one batched encode and upsert.
+
+        wait=False returns once Qdrant has accepted the write, before it is applied.
+        """
+        if not documents:
+            return True
+        with self._operation("update") as op:
+            docs = list(documents.items())
+            units = [(doc_id, unit) for doc_id, doc in docs for unit in self._split(doc_id, doc)]
+            self._store_texts(docs)
+            with op.phase("encode"):
+                vectors = self._embed([text for _, (_, _, text) in units])
+            with op.phase("serialize"):
+                points = [PointStruct(id=point_id, vector=vector, payload=payload)
+                          for (_, (point_id, payload, _)), vector in zip(units, vectors)]
+                self._record_batch("update", len(points), documents.values())
+            with op.phase("server"):
+                self.client.upsert(collection_name=self.collection_name, points=points, wait=wait)
+                if self.chunk_words:
+                    self._delete_stale_chunks(points, wait=wait)
+        self._invalidate()
         return True
     
-    def delete(self, doc_ids: List[str]) -> bool:
-        self.client.delete(collection_name=self.collection_name, points_selector=doc_ids)
+    def _delete_stale_chunks(self, points: List[PointStruct], wait: bool = True):
+        """Delete chunks left over from longer previous versions of the documents just written as `points`"""
+        counts = {point.payload["parent_id"]: point.payload["chunk_count"] for point in points}
+        if not counts:
+            return
+        self.client.delete(collection_name=self.collection_name, wait=wait, points_selector=Filter(should=[
+            Filter(must=[FieldCondition(key="parent_id", match=MatchValue(value=str(doc_id))),
+                         FieldCondition(key="chunk_index", range=Range(gte=count))])
+            for doc_id, count in counts.items()
+        ]))
+    
+    def update_payload(self, selector: Union[List[str], Dict[str, Any], Filter], data: Dict[str, Any],
+                       overwrite: bool = False) -> bool:
+        """Set payload fields on many points without rewriting their vectors.
+
+        `selector` is a list of ids or a filters dict (as for `search`). Fields are merged
+        into the existing payload unless overwrite=True. If `data` carries a `text` field,
+        only the points whose stored text differs are re-embedded. With a text store, an
+        overwrite keeps the stored text unless `data` replaces it.
+        """
+        points = self._build_filter(selector) if isinstance(selector, (dict, Filter)) else list(selector)
+        if not isinstance(points, Filter) and not points:
+            return True
+        if self.chunk_words:
+            self._update_chunked_payload(points, data, overwrite)
+            self._invalidate()
+            return True
+        
+        with self._operation("update_payload") as op:
+            op.details["selector"] = selector if isinstance(selector, dict) else len(points)
+            self._record_batch("update_payload", 0 if isinstance(points, Filter) else len(points), [data])
+            payload = {key: value for key, value in data.items() if key != 'text'} if self.text_store_path else data
+            with op.phase("server"):
+                stale = self._changed_text_ids(points, data['text']) if 'text' in data else []
+                if overwrite:
+                    self.client.overwrite_payload(collection_name=self.collection_name, payload=payload,
+                                                  points=points)
+                elif payload:
+                    self.client.set_payload(collection_name=self.collection_name, payload=payload, points=points)
+            self._store_texts([(point_id, data) for point_id in stale])
+            
+            if stale:
+                with op.phase("encode"):
+                    vector = self._embed([data['text']])[0]
+                with op.phase("server"):
+                    if self.hybrid:
+                        # Re-upsert whole points: sparse vectors cannot be replaced through update_vectors everywhere
+                        records = self.client.retrieve(collection_name=self.collection_name, ids=stale)
+                        self.client.upsert(collection_name=self.collection_name, points=[
+                            PointStruct(id=record.id, vector=vector, payload=record.payload) for record in records
+                        ])
+                    else:
+                        self.client.update_vectors(
+                            collection_name=self.collection_name,
+                            points=[PointVectors(id=point_id, vector=vector) for point_id in stale]
+                        )
+        self._invalidate()
+        return True
+    
+    def _update_chunked_payload(self, points: Union[List[str], Filter], data: Dict[str, Any], overwrite: bool) -> bool:
+        # Chunk points carry per-chunk fields, so overwrites and text changes re-split the document
+        if isinstance(points, Filter):
+            parents = {record.payload["parent_id"] for record in self._scroll_all(points, ["parent_id"])}
+        else:
+            parents = set(map(str, points))
+        
+        if overwrite or 'text' in data:
+            for doc_id in parents:
+                current = self.get(doc_id)
+                if current is not None:
+                    # An overwrite without `text` keeps the document's text, since chunks are derived from it
+                    base = {"text": current["data"].get("text", "")} if overwrite else current["data"]
+                    self.update(doc_id, {**base, **data})
+        elif parents:
+            with self._operation("update_payload") as op, op.phase("server"):
+                self._record_batch("update_payload", len(parents), [data])
+                self.client.set_payload(collection_name=self.collection_name, payload=data,
+                                        points=self._parent_filter(list(parents)))
+        return True
+    
+    def _scroll_all(self, scroll_filter: Filter, with_payload: Any) -> List[Any]:
+        records, offset = [], None
+        while True:
+            page, offset = self.client.scroll(collection_name=self.collection_name, scroll_filter=scroll_filter,
+                                              limit=UPSERT_BATCH_SIZE, offset=offset, with_payload=with_payload)
+            records.extend(page)
+            if offset is None:
+                return records
+    
+    def _changed_text_ids(self, points: Union[List[str], Filter], text: str) -> List[str]:
+        if self.text_store_path:
+            if isinstance(points, Filter):
+                records = self._scroll_all(points, False)
+            else:
+                records = self.client.retrieve(collection_name=self.collection_name, ids=points, with_payload=False)
+            ids = [r.id for r in records]
+            stored = self.text_store.get_many(ids)
+            return [point_id for point_id in ids if stored.get(str(point_id)) != text]
+        if isinstance(points, Filter):
+            records = self._scroll_all(points, ["text"])
+        else:
+            records = self.client.retrieve(collection_name=self.collection_name, ids=points, with_payload=["text"])
+        return [r.id for r in records if (r.payload or {}).get('text') != text]
+    
+    def delete(self, selector: Union[List[str], Dict[str, Any], Filter], wait: bool = True) -> bool:
+        """Delete documents by id, or every document matching a filters dict (as for `search`).
+
+        A filter is applied server-side in one request; only with a text store are the
+        matching ids scrolled first, to drop their texts. wait=False returns once Qdrant
+        has accepted the delete, before it is applied.
+        """
+        if isinstance(selector, (dict, Filter)):
+            query_filter = self._build_filter(selector)
+            if query_filter is None:
+                raise ValueError("An empty filter would delete every document; use drop() instead")
+        else:
+            doc_ids = list(selector)
+            if not doc_ids:
+                return True
+        
+        with self._operation("delete") as op, op.phase("server"):
+            if isinstance(selector, (dict, Filter)):
+                op.details["selector"] = selector if isinstance(selector, dict) else "filter"
+                points = query_filter
+                doc_ids = []
+                if self.text_store_path:
+                    records = self._scroll_all(self._scroll_filter(query_filter),
+                                               ["parent_id"] if self.chunk_words else False)
+                    doc_ids = [(r.payload or {}).get("parent_id", r.id) if self.chunk_words else r.id for r in records]
+            else:
+                self._record_batch("delete", len(doc_ids))
+                points = self._parent_filter(doc_ids) if self.chunk_words else doc_ids
+            self.client.delete(collection_name=self.collection_name, points_selector=points, wait=wait)
+        if self.text_store_path and doc_ids:
+            self.text_store.delete_many(doc_ids)
+        self._invalidate()
         return True
\ No newline at end of file
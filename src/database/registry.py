@@ -0,0 +1,214 @@
+from qdrant_client import QdrantClient, AsyncQdrantClient
+import shutil
+from itertools import count
+from weakref import WeakKeyDictionary
+from typing import Any, Dict, Optional, Set, Tuple, Union
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import QDRANT_URL, QDRANT_API_KEY, VECTOR_BACKEND, LOCAL_INDEX_PATH, EMBEDDING_MODEL, VECTOR_SIZE, EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_SIZE, ENCODER_THREADS, ENCODER_BACKEND, RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_SIMILARITY
+from src.database.embedding_cache import EmbeddingCache
+from src.database.encoders import encoder_name, load_encoder
+from src.database.sparse import BM25Encoder
+from src.database.result_cache import ResultCache
+from src.database.text_store import TextStore
+from src.database.local_index import LocalClient
+from src.database.planner import QueryPlanner
+
+_lock = Lock()
+_clients: Dict[Tuple[Optional[str], Optional[str]], Union[QdrantClient, LocalClient]] = {}
+_encoders: Dict[str, Any] = {}
+_caches: Dict[str, EmbeddingCache] = {}
+_async_clients: Dict[Tuple[Optional[str], Optional[str]], AsyncQdrantClient] = {}
+_encode_executor: Optional[ThreadPoolExecutor] = None
+_sparse_encoder: Optional[BM25Encoder] = None
+_result_cache: Optional[ResultCache] = None
+_text_stores: Dict[str, TextStore] = {}
+# Per-client state is held weakly, keyed on the client itself: a collected client's id() can be
+# reused by a new client, which must not inherit its scope or ready collections.
+# Scope prefix of each client: the endpoint for registry-made clients, so their sync and async
+# clients share cache scopes, and a fresh token for any other client
+_client_scopes: "WeakKeyDictionary[Any, str]" = WeakKeyDictionary()
+_client_tokens = count()
+_ready_collections: "WeakKeyDictionary[Any, Set[str]]" = WeakKeyDictionary()
+_planners: Dict[str, QueryPlanner] = {}
+
+
+def get_client(url: Optional[str] = QDRANT_URL, api_key: Optional[str] = QDRANT_API_KEY,
+               backend: str = VECTOR_BACKEND) -> Union[QdrantClient, LocalClient]:
+    """Return the process-wide client for the configured backend, creating it on first use"""
+    key = (url, api_key) if backend != "local" else ("local", LOCAL_INDEX_PATH)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                if backend == "local":
+                    client = LocalClient(LOCAL_INDEX_PATH)
+                else:
+                    client = QdrantClient(url=url, api_key=api_key)
+                _clients[key] = client
+                _client_scopes[client] = f"{key[0]}" if backend != "local" else f"local:{LOCAL_INDEX_PATH}"
+    return client
+
+
+def get_async_client(url: Optional[str] = QDRANT_URL, api_key: Optional[str] = QDRANT_API_KEY,
+                     backend: str = VECTOR_BACKEND) -> AsyncQdrantClient:
+    """Return the process-wide async client for a Qdrant endpoint, creating it on first use"""
+    if backend == "local":
+        raise ValueError("The local vector backend has no async client; use VectorDB with VECTOR_BACKEND=local")
+    key = (url, api_key)
+    client = _async_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _async_clients.get(key)
+            if client is None:
+                client = AsyncQdrantClient(url=url, api_key=api_key)
+                _async_clients[key] = client
+                _client_scopes[client] = f"{key[0]}"
+    return client
+
+
+def get_encoder(model_name: str = EMBEDDING_MODEL, backend: str = ENCODER_BACKEND):
+    """Return the process-wide encoder for a model and backend ("torch" or "onnx"), loading it on first use"""
+    key = encoder_name(model_name, backend)
+    encoder = _encoders.get(key)
+    if encoder is None:
+        with _lock:
+            encoder = _encoders.get(key)
+            if encoder is None:
+                encoder = load_encoder(model_name, backend)
+                _encoders[key] = encoder
+    return encoder
+
+
+def get_embedding_cache(model_name: str = EMBEDDING_MODEL) -> EmbeddingCache:
+    """Return the process-wide embedding cache for an encoder (see `encoder_name`)"""
+    cache = _caches.get(model_name)
+    if cache is None:
+        with _lock:
+            cache = _caches.get(model_name)
+            if cache is None:
+                cache = EmbeddingCache(model_name, VECTOR_SIZE, EMBEDDING_CACHE_DIR or None, EMBEDDING_CACHE_SIZE)
+                _caches[model_name] = cache
+    return cache
+
+
+def get_sparse_encoder() -> BM25Encoder:
+    """Return the process-wide BM25 encoder, loading the vocabulary on first use"""
+    global _sparse_encoder
+    if _sparse_encoder is None:
+        with _lock:
+            if _sparse_encoder is None:
+                _sparse_encoder = BM25Encoder()
+    return _sparse_encoder
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide search result cache"""
+    global _result_cache
+    if _result_cache is None:
+        with _lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_SIMILARITY or None)
+    return _result_cache
+
+
+def get_text_store(path: str) -> TextStore:
+    """Return the process-wide text store for a directory, opening it on first use"""
+    store = _text_stores.get(path)
+    if store is None:
+        with _lock:
+            store = _text_stores.get(path)
+            if store is None:
+                store = TextStore(path)
+                _text_stores[path] = store
+    return store
+
+
+def remove_text_store(path: str):
+    """Close the text store of a directory and delete its files; the next `get_text_store` starts empty"""
+    with _lock:
+        store = _text_stores.pop(path, None)
+        if store is not None:
+            store.close()
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def collection_scope(client: Any, collection_name: str) -> str:
+    """Key of a collection's data, shared by the sync and async registry clients of one endpoint"""
+    prefix = _client_scopes.get(client)
+    if prefix is None:
+        with _lock:
+            prefix = _client_scopes.get(client)
+            if prefix is None:
+                prefix = _client_scopes[client] = f"client-{next(_client_tokens)}"
+    return f"{prefix}/{collection_name}"
+
+
+def get_planner(client: Any, collection_name: str) -> QueryPlanner:
+    """Return the process-wide query planner of a collection"""
+    scope = collection_scope(client, collection_name)
+    planner = _planners.get(scope)
+    if planner is None:
+        with _lock:
+            planner = _planners.get(scope)
+            if planner is None:
+                planner = QueryPlanner(client, collection_name)
+                _planners[scope] = planner
+    return planner
+
+
+def invalidate_collection(scope: str):
+    """Forget cached search results and planner statistics of a collection after a write to it"""
+    if _result_cache is not None:
+        _result_cache.invalidate(scope)
+    planner = _planners.get(scope)
+    if planner is not None:
+        planner.invalidate()
+
+
+def collection_ready(client: Any, collection_name: str) -> bool:
+    """Whether a collection was already set up through this client in this process"""
+    return collection_name in _ready_collections.get(client, ())
+
+
+def mark_collection_ready(client: Any, collection_name: str, ready: bool = True):
+    with _lock:
+        if ready:
+            _ready_collections.setdefault(client, set()).add(collection_name)
+        else:
+            _ready_collections.get(client, set()).discard(collection_name)
+
+
+def get_encode_executor() -> ThreadPoolExecutor:
+    """Return the bounded thread pool that async callers use to run the encoder"""
+    global _encode_executor
+    if _encode_executor is None:
+        with _lock:
+            if _encode_executor is None:
+                _encode_executor = ThreadPoolExecutor(max_workers=ENCODER_THREADS, thread_name_prefix="encoder")
+    return _encode_executor
+
+
+def clear():
+    """Drop all shared clients and encoders (mainly for tests and forked workers)"""
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+        _encoders.clear()
+        _caches.clear()
+        _ready_collections.clear()
+        _client_scopes.clear()
+        _planners.clear()
+        for store in _text_stores.values():
+            store.close()
+        _text_stores.clear()
+        global _sparse_encoder, _result_cache
+        _sparse_encoder = None
+        _result_cache = None
+        # Async clients are closed by their owners on the event loop; here they are only forgotten
+        _async_clients.clear()
\ No newline at end of file
@@ -0,0 +1,32 @@
+from typing import List, Sequence
+import numpy as np
+
+
+def mmr(vectors: np.ndarray, relevance: Sequence[float], k: int, lambda_mult: float = 0.5) -> List[int]:
+    """Indices of up to k candidates picked by maximal marginal relevance.
+
+    Each step takes the candidate maximising
+    lambda_mult * relevance - (1 - lambda_mult) * (max cosine similarity to those already picked),
+    so lambda_mult=1 keeps the relevance order and lower values trade relevance for diversity.
+    All pairwise similarities come from one matrix product; each step is a vector update.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    n = len(vectors)
+    if n == 0 or k <= 0:
+        return []
+    unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    similarity = unit @ unit.T
+    relevance = np.asarray(relevance, dtype=np.float32)
+
+    picked = [int(np.argmax(relevance))]
+    available = np.ones(n, dtype=bool)
+    available[picked[0]] = False
+    redundancy = similarity[picked[0]].copy()
+    while len(picked) < min(k, n):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return picked
@@ -0,0 +1,150 @@
+import copy
+import json
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from threading import Lock
+from src.database.embedding_cache import normalize_text
+
+
+class ResultCache:
+    """LRU cache of search results with a TTL and per-collection write generations.
+
+    Every entry remembers its collection's generation when it was stored; `invalidate`
+    bumps the generation, so all older entries of that collection miss from then on.
+    Writes from other processes are not seen, which bounds staleness by `ttl`.
+
+    With a `similarity` threshold, `get_similar` also serves a query whose embedding is
+    within that cosine similarity of a cached query with the same filters and options.
+    Query vectors are kept stacked per signature, so a lookup is one matrix product,
+    computed outside the lock.
+    """
+
+    def __init__(self, max_items: int = 1000, ttl: float = 30.0, similarity: Optional[float] = None):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.similarity = similarity
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        # key -> (stored at, generation, normalized query vector or None, results)
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Optional[np.ndarray], List[Dict]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        # signature -> {key: query vector} for entries stored with a vector, and its stacked
+        # (keys, matrix) form, rebuilt on the first lookup after the signature's entries change
+        self._vectors: Dict[Tuple, Dict[Tuple, np.ndarray]] = {}
+        self._matrices: Dict[Tuple, Tuple[List[Tuple], np.ndarray]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def signature(collection: str, filters: Any, limit: int, **options: Any) -> Tuple:
+        """Everything except the query text that determines a search's results"""
+        filters_key = json.dumps(filters, sort_keys=True, default=repr)
+        return collection, filters_key, limit, tuple(sorted(options.items()))
+
+    @staticmethod
+    def key(signature: Tuple, query: str) -> Tuple:
+        return signature + (normalize_text(query),)
+
+    def generation(self, collection: str) -> int:
+        return self._generations.get(collection, 0)
+
+    def invalidate(self, collection: str):
+        """Make every cached result of `collection` stale (call after writes)"""
+        with self._lock:
+            self._generations[collection] = self.generation(collection) + 1
+
+    def _fresh(self, entry: Tuple, collection: str, now: float) -> bool:
+        return now - entry[0] < self.ttl and entry[1] == self.generation(collection)
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._fresh(entry, key[0], now):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[3])
+
+    def get_similar(self, signature: Tuple, vector: np.ndarray) -> Optional[List[Dict]]:
+        """Results of the most similar cached query with the same signature, if above the threshold"""
+        if not self.similarity:
+            return None
+        with self._lock:
+            stacked = self._stacked(signature)
+        if stacked is None:
+            return None
+        keys, matrix = stacked
+        scores = matrix @ self._unit(vector)
+        candidates = np.flatnonzero(scores >= self.similarity)
+        if not len(candidates):
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            # Best first; entries may have gone stale or been evicted since the matrix was built
+            for index in candidates[np.argsort(-scores[candidates], kind="stable")]:
+                key = keys[index]
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if not self._fresh(entry, key[0], now):
+                    self._remove(key)
+                    continue
+                self._entries.move_to_end(key)
+                # The exact lookup for this query already counted a miss
+                self.misses -= 1
+                self.near_hits += 1
+                return copy.deepcopy(entry[3])
+            return None
+
+    def put(self, key: Tuple, results: List[Dict], generation: int, vector: Optional[np.ndarray] = None):
+        """Store results computed while the collection was at `generation`"""
+        stored_vector = self._unit(vector) if vector is not None and self.similarity else None
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic(), generation, stored_vector, copy.deepcopy(results))
+            if stored_vector is not None:
+                self._vectors.setdefault(key[:-1], {})[key] = stored_vector
+                self._matrices.pop(key[:-1], None)
+            while len(self._entries) > self.max_items:
+                self._remove(next(iter(self._entries)))
+
+    def _stacked(self, signature: Tuple) -> Optional[Tuple[List[Tuple], np.ndarray]]:
+        """(keys, unit query vectors as rows) of the signature's entries; call with the lock held"""
+        stacked = self._matrices.get(signature)
+        if stacked is None:
+            vectors = self._vectors.get(signature)
+            if not vectors:
+                return None
+            stacked = self._matrices[signature] = (list(vectors), np.stack(list(vectors.values())))
+        return stacked
+
+    def _remove(self, key: Tuple):
+        """Drop an entry and its query vector; call with the lock held"""
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[2] is None:
+            return
+        signature = key[:-1]
+        vectors = self._vectors[signature]
+        del vectors[key]
+        if not vectors:
+            del self._vectors[signature]
+        self._matrices.pop(signature, None)
+
+    @staticmethod
+    def _unit(vector: Any) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            self._matrices.clear()
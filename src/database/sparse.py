@@ -0,0 +1,143 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+import json
+import math
+import os
+import re
+import zlib
+from qdrant_client.models import ScoredPoint, SparseVector
+from config.settings import BM25_VOCAB_PATH, BM25_STATS_PATH, BM25_AVG_DOC_LEN
+
+# Name of the sparse vector stored next to the (unnamed) dense vector
+SPARSE_VECTOR_NAME = "bm25"
+FUSION_METHODS = ("rrf", "weighted")
+
+_TOKEN = re.compile(r"[^\W_]+(?:['-][^\W_]+)*")
+_HTML_BREAK = re.compile(r"<br\s*/?>", re.IGNORECASE)
+# Out-of-vocabulary tokens (names, titles) are hashed into this many slots after the vocabulary
+HASH_SLOTS = 1 << 20
+# aclImdb size; only used to turn vocabulary ranks into document frequencies when not fitted
+DEFAULT_CORPUS_SIZE = 100000
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(_HTML_BREAK.sub(" ", text).lower())
+
+
+class BM25Encoder:
+    """BM25 as sparse vectors: documents carry saturated term frequencies, queries carry IDF.
+
+    The dot product of a document and a query vector is the document's BM25 score for
+    the query. Term ids come from `imdb.vocab`; words missing from it are hashed into
+    slots after the vocabulary. Until `fit` is called (or stats are loaded from
+    `stats_path`) document frequencies are estimated from the vocabulary's frequency
+    order with Zipf's law, and unseen words count as rare.
+    """
+
+    def __init__(self, vocab_path: Optional[str] = BM25_VOCAB_PATH, stats_path: Optional[str] = BM25_STATS_PATH,
+                 k1: float = 1.2, b: float = 0.75, avg_doc_len: float = BM25_AVG_DOC_LEN):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_len = avg_doc_len
+        self.vocab: Dict[str, int] = {}
+        if vocab_path and os.path.exists(vocab_path):
+            with open(vocab_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    term = line.strip()
+                    if term and term not in self.vocab:
+                        self.vocab[term] = len(self.vocab)
+        self.corpus_size = DEFAULT_CORPUS_SIZE
+        self.doc_freqs: Optional[Dict[int, int]] = None
+        if stats_path and os.path.exists(stats_path):
+            self.load(stats_path)
+
+    def term_id(self, term: str) -> int:
+        index = self.vocab.get(term)
+        if index is None:
+            index = len(self.vocab) + zlib.crc32(term.encode("utf-8")) % HASH_SLOTS
+        return index
+
+    def idf(self, index: int) -> float:
+        if self.doc_freqs is not None:
+            doc_freq = self.doc_freqs.get(index, 0)
+        elif index < len(self.vocab):
+            # Zipf: the word at rank r appears in roughly 1/r of the documents the top words do
+            doc_freq = self.corpus_size * min(1.0, 50.0 / (index + 1))
+        else:
+            doc_freq = 0
+        return math.log(1 + (self.corpus_size - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    @staticmethod
+    def _sparse(weights: Dict[int, float]) -> SparseVector:
+        indices = sorted(weights)
+        return SparseVector(indices=indices, values=[weights[i] for i in indices])
+
+    def encode_documents(self, texts: Iterable[str]) -> List[SparseVector]:
+        vectors = []
+        for text in texts:
+            counts = Counter(self.term_id(term) for term in tokenize(text))
+            length = sum(counts.values())
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_doc_len)
+            vectors.append(self._sparse({index: tf * (self.k1 + 1) / (tf + norm) for index, tf in counts.items()}))
+        return vectors
+
+    def encode_queries(self, texts: Iterable[str]) -> List[SparseVector]:
+        return [self._sparse({index: self.idf(index) for index in {self.term_id(term) for term in tokenize(text)}})
+                for text in texts]
+
+    def fit(self, texts: Iterable[str]) -> "BM25Encoder":
+        """Replace the estimated statistics with exact document frequencies and average length"""
+        doc_freqs: Counter = Counter()
+        docs, total_len = 0, 0
+        for text in texts:
+            terms = [self.term_id(term) for term in tokenize(text)]
+            doc_freqs.update(set(terms))
+            docs += 1
+            total_len += len(terms)
+        if docs:
+            self.doc_freqs = dict(doc_freqs)
+            self.corpus_size = docs
+            self.avg_doc_len = total_len / docs
+        return self
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"corpus_size": self.corpus_size, "avg_doc_len": self.avg_doc_len,
+                       "doc_freqs": self.doc_freqs}, f)
+
+    def load(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            stats = json.load(f)
+        self.corpus_size = stats["corpus_size"]
+        self.avg_doc_len = stats["avg_doc_len"]
+        if stats["doc_freqs"] is not None:
+            self.doc_freqs = {int(index): freq for index, freq in stats["doc_freqs"].items()}
+
+
+def fuse(dense: Sequence[ScoredPoint], sparse: Sequence[ScoredPoint], method: str = "rrf",
+         alpha: float = 0.5, rrf_k: int = 60) -> List[ScoredPoint]:
+    """Merge dense and sparse hit lists into one ranking.
+
+    "rrf" scores each point by sum(1 / (rrf_k + rank)); "weighted" min-max normalises each
+    list and combines them as alpha * dense + (1 - alpha) * sparse.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
+
+    scores: Dict[object, float] = {}
+    points: Dict[object, ScoredPoint] = {}
+    for hits, weight in ((dense, alpha), (sparse, 1 - alpha)):
+        if method == "weighted" and hits:
+            high, low = max(hit.score for hit in hits), min(hit.score for hit in hits)
+        for rank, hit in enumerate(hits):
+            points.setdefault(hit.id, hit)
+            if method == "rrf":
+                contribution = 1.0 / (rrf_k + rank + 1)
+            else:
+                contribution = weight * ((hit.score - low) / (high - low) if high > low else 1.0)
+            scores[hit.id] = scores.get(hit.id, 0.0) + contribution
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [ScoredPoint(id=point_id, version=points[point_id].version, score=score,
+                        payload=points[point_id].payload, vector=points[point_id].vector)
+            for point_id, score in ranked]
@@ -0,0 +1,99 @@
+from typing import Dict, Iterable, Optional, Tuple
+from threading import Lock
+import mmap
+import os
+import zlib
+
+
+class TextStore:
+    """Compressed document texts kept next to, not inside, the vector database.
+
+    Texts are zlib-compressed and appended to `texts.blob`; an append-only `index.txt`
+    maps each id to the offset and length of its latest record (length -1 marks a
+    deletion). Reads go through a read-only memory map of the blob, so fetching a text
+    costs a page fault and a decompress instead of shipping it in every response.
+    Overwritten and deleted texts stay in the blob as garbage until the store is rebuilt.
+    Only one process should write to a store at a time.
+    """
+
+    def __init__(self, path: str, level: int = 6):
+        self.path = path
+        self.level = level
+        os.makedirs(path, exist_ok=True)
+        self._blob_path = os.path.join(path, "texts.blob")
+        self._index_path = os.path.join(path, "index.txt")
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._lock = Lock()
+        self._map: Optional[mmap.mmap] = None
+
+        size = os.path.getsize(self._blob_path) if os.path.exists(self._blob_path) else 0
+        if os.path.exists(self._index_path):
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 3:
+                        continue
+                    key, offset, length = parts[0], int(parts[1]), int(parts[2])
+                    if length < 0:
+                        self._index.pop(key, None)
+                    elif offset + length <= size:
+                        # Entries past the end of the blob were never fully written (e.g. a crash)
+                        self._index[key] = (offset, length)
+        self._blob = open(self._blob_path, "ab")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return str(key) in self._index
+
+    def put_many(self, items: Iterable[Tuple[str, str]]):
+        with self._lock:
+            lines = []
+            offset = self._blob.tell()
+            for key, text in items:
+                data = zlib.compress(text.encode("utf-8"), self.level)
+                self._blob.write(data)
+                self._index[str(key)] = (offset, len(data))
+                lines.append(f"{key} {offset} {len(data)}\n")
+                offset += len(data)
+            if lines:
+                # The blob is flushed before the index so the index never points past written data
+                self._blob.flush()
+                with open(self._index_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Texts of the given ids; unknown ids are left out"""
+        with self._lock:
+            locations = {str(key): self._index[str(key)] for key in keys if str(key) in self._index}
+            if not locations:
+                return {}
+            end = max(offset + length for offset, length in locations.values())
+            if self._map is None or len(self._map) < end:
+                self._remap()
+            blobs = {key: self._map[offset:offset + length] for key, (offset, length) in locations.items()}
+        return {key: zlib.decompress(blob).decode("utf-8") for key, blob in blobs.items()}
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(str(key))
+
+    def delete_many(self, keys: Iterable[str]):
+        with self._lock:
+            lines = [f"{key} 0 -1\n" for key in map(str, keys) if self._index.pop(key, None) is not None]
+            if lines:
+                with open(self._index_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        with open(self._blob_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._blob.close()
@@ -0,0 +1,187 @@
+from itertools import groupby
+from threading import Event, Thread
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+import queue
+import time
+from qdrant_client.models import Filter, PointIdsList
+from config.settings import UPSERT_BATCH_SIZE, WRITE_QUEUE_DEPTH, WRITE_QUEUE_LINGER_MS
+from src.database.qdrant_client import VectorDB
+
+logger = logging.getLogger(__name__)
+
+# Queue entry kinds; entries are (kind, doc id, document / filter / barrier event)
+_UPSERT, _DELETE, _DELETE_FILTER, _FLUSH, _STOP = "upsert", "delete", "delete_filter", "flush", "stop"
+# Seconds between checks that the writer thread is still alive while flush() waits
+_LIVENESS_INTERVAL = 1.0
+
+
+class WriteQueue:
+    """Background writer that turns many small writes to one collection into batched requests.
+
+    `insert`, `update` and `delete` only enqueue. One writer thread drains the queue,
+    waiting up to `linger_ms` to collect `batch_size` writes, merges consecutive upserts
+    (inserts and full updates, last write per id wins) and consecutive id deletes, and sends
+    each run as one request with wait=False. Runs go out in the order they were queued.
+
+    At most `max_pending` writes wait in the queue; past that producers block (or get
+    `queue.Full` after `timeout` seconds), so a fast stream slows to the writer's pace
+    instead of growing memory. `flush()` returns once everything queued before it has been
+    applied, and raises the first background error since the previous flush. Call
+    `close()` (or use the queue as a context manager) before exiting, or queued writes are lost.
+    """
+
+    def __init__(self, db: VectorDB, batch_size: int = UPSERT_BATCH_SIZE, max_pending: int = WRITE_QUEUE_DEPTH,
+                 linger_ms: float = WRITE_QUEUE_LINGER_MS, timeout: Optional[float] = None):
+        self.db = db
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.timeout = timeout
+        self._queue: "queue.Queue[Tuple[str, Any, Any]]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[Exception] = None
+        # Writes sent with wait=False that no later wait=True request has confirmed yet
+        self._unconfirmed = False
+        self._closed = False
+        self._thread = Thread(target=self._run, name=f"write-queue-{db.collection_name}", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def insert(self, documents: Iterable[Dict[str, Any]]) -> List[str]:
+        """Queue documents for upsert; returns their ids right away"""
+        ids = []
+        for doc in documents:
+            doc_id = self.db._document_id(doc)
+            self._put((_UPSERT, doc_id, doc))
+            ids.append(doc_id)
+        return ids
+
+    def update(self, doc_id: str, data: Dict[str, Any]):
+        """Queue a full replacement of a document (partial updates go through `db.update_payload`)"""
+        self._put((_UPSERT, str(doc_id), data))
+
+    def delete(self, selector: Union[List[str], Dict[str, Any], Filter]):
+        """Queue deletion of ids, or of every document matching a filters dict (see `VectorDB.delete`)"""
+        if isinstance(selector, (dict, Filter)):
+            # Compile now so an invalid filter fails in the caller, not the writer thread
+            query_filter = self.db._build_filter(selector)
+            if query_filter is None:
+                raise ValueError("An empty filter would delete every document; use drop() instead")
+            self._put((_DELETE_FILTER, None, query_filter))
+        else:
+            for doc_id in selector:
+                self._put((_DELETE, str(doc_id), None))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every write queued so far is applied"""
+        self._check_writer()
+        done = Event()
+        self._put((_FLUSH, None, done))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(_LIVENESS_INTERVAL if deadline is None
+                            else min(_LIVENESS_INTERVAL, max(0.0, deadline - time.monotonic()))):
+            self._check_writer()
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Write queue for '{self.db.collection_name}' did not flush within {timeout}s")
+        self._raise_error()
+
+    def close(self):
+        """Flush, then stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put((_STOP, None, Event()))
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> "WriteQueue":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _put(self, entry: Tuple[str, Any, Any]):
+        if self._closed:
+            raise RuntimeError(f"Write queue for '{self.db.collection_name}' is closed")
+        self._queue.put(entry, timeout=self.timeout)
+
+    def _check_writer(self):
+        if not self._thread.is_alive():
+            self._raise_error()
+            raise RuntimeError(f"Writer thread of the write queue for '{self.db.collection_name}' has stopped")
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while True:
+            entries = [self._queue.get()]
+            try:
+                deadline = time.monotonic() + self.linger
+                while entries[-1][0] not in (_FLUSH, _STOP) and len(entries) < self.batch_size:
+                    try:
+                        entries.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                self.db.metrics.observe("vectordb_write_queue_depth", self._queue.qsize(),
+                                        collection=self.db.collection_name)
+                if not self._apply(entries):
+                    return
+            except Exception as e:
+                # Keep the writer alive and release the batch's barriers, so no flush() waits forever
+                self._failed(e)
+                barriers = [(kind, event) for kind, _, event in entries if kind in (_FLUSH, _STOP)]
+                for _, event in barriers:
+                    event.set()
+                if any(kind == _STOP for kind, _ in barriers):
+                    return
+
+    def _apply(self, entries: List[Tuple[str, Any, Any]]) -> bool:
+        """Send the entries as one request per run of same-kind writes; False once told to stop"""
+        for kind, run in groupby(entries, key=lambda entry: entry[0]):
+            run = list(run)
+            if kind == _UPSERT:
+                self._send(self.db.update_many, {doc_id: doc for _, doc_id, doc in run})
+            elif kind == _DELETE:
+                self._send(self.db.delete, list(dict.fromkeys(doc_id for _, doc_id, _ in run)))
+            elif kind == _DELETE_FILTER:
+                for _, _, query_filter in run:
+                    self._send(self.db.delete, query_filter)
+            else:
+                self._confirm()
+                for _, _, done in run:
+                    done.set()
+                if kind == _STOP:
+                    return False
+        return True
+
+    def _send(self, write: Any, argument: Any):
+        try:
+            write(argument, wait=False)
+            self._unconfirmed = True
+        except Exception as e:
+            self._failed(e)
+
+    def _confirm(self):
+        # Qdrant applies a collection's updates in order, so one waited no-op confirms every earlier write
+        if not self._unconfirmed:
+            return
+        try:
+            self.db.client.delete(collection_name=self.db.collection_name, points_selector=PointIdsList(points=[]),
+                                  wait=True)
+            self._unconfirmed = False
+            # Each write invalidated the caches when Qdrant accepted it; a search between then and
+            # now may have cached pre-write results under the new generation
+            self.db._invalidate()
+        except Exception as e:
+            self._failed(e)
+
+    def _failed(self, error: Exception):
+        logger.error("Background write to '%s' failed: %s", self.db.collection_name, error)
+        self.db.metrics.increment("vectordb_write_queue_errors_total", collection=self.db.collection_name)
+        if self._error is None:
+            self._error = error
@@ -0,0 +1,59 @@
+from qdrant_client.models import ScoredPoint
+from src.database.chunking import chunk_id, chunk_text, collapse_hits, split_document
+
+def words(count):
+    return " ".join(f"w{i}" for i in range(count))
+
+def hit(point_id, score, parent_id=None):
+    payload = {"parent_id": parent_id} if parent_id else {}
+    return ScoredPoint(id=point_id, version=0, score=score, payload=payload)
+
+def test_short_texts_stay_whole():
+    assert chunk_text("a  b", 4, 1) == ["a  b"]
+    assert chunk_text(words(100), 0, 32) == [words(100)]
+
+def test_windows_overlap_and_cover_the_text():
+    chunks = chunk_text(words(10), 4, 1)
+    assert chunks == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+    # A tail shorter than the overlap adds no window of its own
+    assert chunk_text(words(11), 4, 1)[-1] == "w9 w10"
+    assert len(chunk_text(words(300), 160, 32)) == 3
+
+def test_overlap_must_be_smaller_than_the_window():
+    for overlap in (4, 5, -1):
+        try:
+            chunk_text(words(10), 4, overlap)
+        except ValueError:
+            continue
+        raise AssertionError(f"overlap {overlap} was accepted")
+
+def test_split_document_keeps_text_on_the_head_chunk():
+    parent_id = "8e01d6dc-fc37-5dab-89f7-6fd55009d17b"
+    points = split_document(parent_id, {"text": words(10), "sentiment": "positive"}, 4, 1)
+    assert [point_id for point_id, _ in points] == [chunk_id(parent_id, index) for index in range(3)]
+    assert [payload.get("text") for _, payload in points] == [words(10), None, None]
+    assert all(payload["sentiment"] == "positive" and payload["chunk_count"] == 3 for _, payload in points)
+
+def test_collapse_hits_ranks_parents():
+    hits = [hit(1, 0.9, "a"), hit(2, 0.3, "a"), hit(3, 0.8, "b"), hit(4, 0.7, "b"), hit(5, 0.85)]
+    assert [(parent, score) for parent, score, _ in collapse_hits(hits, 3)] == [("a", 0.9), (5, 0.85), ("b", 0.8)]
+    mean = collapse_hits(hits, 3, "mean")
+    assert [parent for parent, _, _ in mean] == [5, "b", "a"]
+    assert [point.id for point in mean[1][2]] == [3, 4]
+    assert len(collapse_hits(hits, 1)) == 1
+
+def test_collapse_hits_rejects_unknown_modes():
+    try:
+        collapse_hits([], 1, "min")
+    except ValueError:
+        return
+    raise AssertionError("unknown collapse mode was accepted")
+
+if __name__ == "__main__":
+    test_short_texts_stay_whole()
+    test_windows_overlap_and_cover_the_text()
+    test_overlap_must_be_smaller_than_the_window()
+    test_split_document_keeps_text_on_the_head_chunk()
+    test_collapse_hits_ranks_parents()
+    test_collapse_hits_rejects_unknown_modes()
+    print("chunking tests passed")
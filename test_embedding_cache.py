@@ -0,0 +1,40 @@
+import tempfile
+from multiprocessing import get_context
+import numpy as np
+from src.database.embedding_cache import EmbeddingCache
+
+DIM = 4
+
+def vector_for(text):
+    # Each text gets a distinct, recomputable vector
+    return np.full(DIM, sum(map(ord, text)) + len(text) * 1000, dtype=np.float32)
+
+def write_texts(cache_dir, prefix, count=1500, batch=50):
+    cache = EmbeddingCache("m", DIM, cache_dir)
+    for start in range(0, count, batch):
+        texts = [f"{prefix} {i}" for i in range(start, start + batch)]
+        cache.put_many(texts, np.stack([vector_for(text) for text in texts]))
+
+def test_two_handles_share_directory():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first, second = EmbeddingCache("m", DIM, cache_dir), EmbeddingCache("m", DIM, cache_dir)
+        first.put_many(["x"], np.ones((1, DIM)))
+        second.put_many(["y"], np.full((1, DIM), 2.0))
+        x, y = EmbeddingCache("m", DIM, cache_dir).get_many(["x", "y"])
+        assert x.tolist() == [1.0] * DIM and y.tolist() == [2.0] * DIM
+
+def test_concurrent_writer_processes():
+    # Two processes append batches to the same directory at once, growing the file past its initial size
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with get_context("spawn").Pool(2) as pool:
+            pool.starmap(write_texts, [(cache_dir, "alpha"), (cache_dir, "beta")])
+
+        texts = [f"{prefix} {i}" for prefix in ("alpha", "beta") for i in range(1500)]
+        vectors = EmbeddingCache("m", DIM, cache_dir).get_many(texts)
+        wrong = [text for text, vector in zip(texts, vectors) if vector is None or not np.array_equal(vector, vector_for(text))]
+        assert not wrong, f"{len(wrong)} texts returned a missing or foreign vector, e.g. {wrong[:3]}"
+
+if __name__ == "__main__":
+    test_two_handles_share_directory()
+    test_concurrent_writer_processes()
+    print("embedding cache tests passed")
@@ -0,0 +1,41 @@
+import time
+import numpy as np
+from src.database.encoders import load_encoder
+from src.data_loader import DataLoader
+from config.settings import EMBEDDING_MODEL
+
+# Minimum cosine similarity between PyTorch and ONNX embeddings of the same text
+PARITY_THRESHOLDS = {False: 0.999, True: 0.98}
+
+def test_encoder_parity(limit=200, queries=20, k=10):
+    # Compare the ONNX Runtime encoders (fp32 and int8) against the PyTorch encoder
+    reviews = [doc['text'] for doc in DataLoader.load_imdb_reviews(limit=limit)]
+    reviews += ["great movie", "terrible film", "avatar"]
+
+    torch_encoder = load_encoder(EMBEDDING_MODEL, "torch")
+    start = time.perf_counter()
+    reference = torch_encoder.encode(reviews, batch_size=32)
+    torch_seconds = time.perf_counter() - start
+    print(f"torch: {len(reviews) / torch_seconds:.1f} texts/sec")
+
+    for quantize in (False, True):
+        onnx_encoder = load_encoder(EMBEDDING_MODEL, "onnx", quantize=quantize)
+        start = time.perf_counter()
+        embeddings = onnx_encoder.encode(reviews, batch_size=32)
+        onnx_seconds = time.perf_counter() - start
+
+        similarity = np.sum(reference * embeddings, axis=1)
+        # Ranking parity: the top-k neighbours of the first reviews should barely move
+        overlap = []
+        for row in range(queries):
+            expected = set(np.argsort(-(reference @ reference[row]))[:k])
+            found = set(np.argsort(-(embeddings @ embeddings[row]))[:k])
+            overlap.append(len(expected & found) / k)
+
+        label = "int8" if quantize else "fp32"
+        print(f"onnx {label}: {len(reviews) / onnx_seconds:.1f} texts/sec, "
+              f"cosine min {similarity.min():.4f} mean {similarity.mean():.4f}, top-{k} overlap {np.mean(overlap):.3f}")
+        assert similarity.min() >= PARITY_THRESHOLDS[quantize], f"onnx {label} embeddings drifted from torch"
+
+if __name__ == "__main__":
+    test_encoder_parity()
@@ -0,0 +1,65 @@
+from qdrant_client.models import Filter, MatchAny, MatchExcept, MatchValue, PayloadSchemaType, Range
+from src.database.filters import build_filter
+
+INDEXES = {"sentiment": PayloadSchemaType.KEYWORD, "rating": PayloadSchemaType.INTEGER,
+           "score": PayloadSchemaType.FLOAT}
+
+def raises_value_error(filters, **kwargs):
+    try:
+        build_filter(filters, INDEXES, **kwargs)
+    except ValueError:
+        return True
+    return False
+
+def test_plain_values_and_empty_filters():
+    assert build_filter(None) is None and build_filter({}) is None
+    query_filter = build_filter({"sentiment": "positive"}, INDEXES)
+    assert query_filter.must[0].match == MatchValue(value="positive") and query_filter.must_not is None
+    # Prebuilt Filters pass through untouched
+    assert build_filter(query_filter) is query_filter
+
+def test_lone_or_is_flattened():
+    query_filter = build_filter({"$or": [{"sentiment": "positive"}, {"rating": {"gte": 8}}]}, INDEXES)
+    assert query_filter.must is None and len(query_filter.should) == 2
+    assert query_filter.should[0].must[0].key == "sentiment"
+    assert query_filter.should[1].must[0].range == Range(gte=8)
+
+def test_or_next_to_fields_stays_nested():
+    query_filter = build_filter({"source": "imdb", "$or": [{"rating": 1}, {"rating": 10}]}, INDEXES)
+    assert query_filter.must[0].key == "source"
+    assert isinstance(query_filter.must[1], Filter) and len(query_filter.must[1].should) == 2
+
+def test_in_nin_and_ne():
+    query_filter = build_filter({"sentiment": {"nin": ["negative", "neutral"]}, "rating": [7, 8],
+                                 "source": {"ne": "imdb"}}, INDEXES)
+    nin, any_of = query_filter.must
+    assert nin.match == MatchExcept(**{"except": ["negative", "neutral"]})
+    assert any_of.match == MatchAny(any=[7, 8])
+    assert query_filter.must_not[0].match == MatchValue(value="imdb")
+
+def test_values_must_match_the_index_type():
+    assert raises_value_error({"rating": 8.5})
+    assert raises_value_error({"rating": {"in": [8, 9.5]}})
+    assert raises_value_error({"rating": True})
+    assert raises_value_error({"sentiment": 1})
+    # Ranges accept floats on integer indexes but need a numeric index
+    assert build_filter({"rating": {"gt": 7.5}}, INDEXES).must[0].range == Range(gt=7.5)
+    assert raises_value_error({"sentiment": {"gte": 1}})
+    assert build_filter({"score": {"lte": 0.5}}, INDEXES).must[0].range == Range(lte=0.5)
+
+def test_invalid_specs():
+    assert raises_value_error({"$xor": [{"rating": 1}]})
+    assert raises_value_error({"$or": []})
+    assert raises_value_error({"rating": {"between": [1, 2]}})
+    assert raises_value_error({"sentiment": {"in": []}})
+    assert raises_value_error({"unindexed": "x"}, strict=True)
+    assert not raises_value_error({"unindexed": "x"})
+
+if __name__ == "__main__":
+    test_plain_values_and_empty_filters()
+    test_lone_or_is_flattened()
+    test_or_next_to_fields_stays_nested()
+    test_in_nin_and_ne()
+    test_values_must_match_the_index_type()
+    test_invalid_specs()
+    print("filter DSL tests passed")
@@ -1,28 +1,14 @@
 from src.database.qdrant_client import VectorDB
+from src.database.federated import FederatedSearch
 from src.data_loader import DataLoader
 
 def filter_all_collections(query, filters, limit=3):
     """Filter across all three collections and return combined results"""
-    collections = {
-        "imdb_reviews": VectorDB("imdb_reviews"),
-        "sentiment_reviews": VectorDB("sentiment_reviews"), 
-        "tv_reviews": VectorDB("tv_reviews")
-    }
-    
-    all_results = []
-    
-    for collection_name, db in collections.items():
-        try:
-            results = db.search(query, limit=limit, filters=filters)
-            for result in results:
-                result['collection'] = collection_name
-                all_results.append(result)
-        except Exception as e:
+    with FederatedSearch(["imdb_reviews", "sentiment_reviews", "tv_reviews"]) as federated:
+        results = federated.search(query, limit=limit, filters=filters)
+        for collection_name in federated.errors:
             print(f"No results in {collection_name} with filters {filters}")
-    
-    # Sort by score descending
-    all_results.sort(key=lambda x: x['score'], reverse=True)
-    return all_results[:limit]
+    return results
 
 def test_filters():
     # # Setup data in all collections
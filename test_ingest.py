@@ -0,0 +1,78 @@
+import os
+import tempfile
+import uuid
+import zlib
+import numpy as np
+from config.settings import VECTOR_SIZE
+from src.database.ingest import IngestCheckpoint, document_id
+from src.database.local_index import LocalClient
+from src.database.qdrant_client import VectorDB
+
+class OfflineVectorDB(VectorDB):
+    """VectorDB on the in-process index with a deterministic stand-in for the embedding model"""
+
+    def _encode(self, texts, batch_size=None, encoder=None):
+        rows = [np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(VECTOR_SIZE) for text in texts]
+        return np.asarray(rows, dtype=np.float32).reshape(len(texts), VECTOR_SIZE)
+
+def test_file_documents_are_keyed_by_source():
+    review = {"text": "Great film", "source": "imdb", "split": "train", "sentiment": "positive", "file": "1_10.txt"}
+    assert document_id(review) == document_id({**review, "text": "Edited text", "rating": 10})
+    # aclImdb repeats file names across splits and labels
+    assert document_id(review) != document_id({**review, "split": "test"})
+    assert document_id(review) != document_id({**review, "sentiment": "negative"})
+    assert uuid.UUID(document_id(review)).version == 5
+
+def test_text_documents_are_keyed_by_text_and_labels():
+    row = {"text": "Show: A drama", "sentiment": "positive", "rating": 9.0, "source": "csv_dataset",
+           "word_count": 3, "char_count": 13}
+    assert document_id(row) == document_id({**row, "text": " Show:  A drama "})
+    assert document_id(row) == document_id({"rating": 9.0, "source": "csv_dataset", "sentiment": "positive",
+                                            "text": "Show: A drama"})
+    # Rows sharing a text but not their labels stay separate points
+    assert document_id(row) != document_id({**row, "sentiment": "negative", "rating": 4.0})
+    assert document_id(row) != document_id({**row, "text": "Show: A comedy"})
+
+def test_checkpoint_survives_reopening():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "nested", "ingest.ckpt")
+        checkpoint = IngestCheckpoint(path)
+        assert not checkpoint.is_done(0, ["a", "b"])
+        checkpoint.mark_done(0, ["a", "b"])
+        checkpoint.mark_done(1, ["c"])
+
+        reopened = IngestCheckpoint(path)
+        assert reopened.is_done(0, ["a", "b"]) and reopened.is_done(1, ["c"])
+        # A changed stream puts other ids at a batch position, which must be ingested again
+        assert not reopened.is_done(0, ["a", "x"]) and not reopened.is_done(2, ["c"])
+
+def test_checkpoint_ignores_a_torn_last_line():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ingest.ckpt")
+        IngestCheckpoint(path).mark_done(0, ["a"])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"batch": 1, "dig')
+        checkpoint = IngestCheckpoint(path)
+        assert checkpoint.is_done(0, ["a"]) and not checkpoint.is_done(1, ["b"])
+
+def test_reinserting_a_shorter_document_drops_its_old_chunks():
+    client = LocalClient()
+    db = OfflineVectorDB("ingest", client=client, chunk_words=10, chunk_overlap=2, use_cache=False,
+                         use_result_cache=False)
+    review = {"text": " ".join(f"w{i}" for i in range(70)), "source": "imdb", "file": "1_10.txt"}
+    other = {"text": " ".join(f"z{i}" for i in range(40)), "source": "imdb", "file": "2_10.txt"}
+    doc_id, other_id = db.insert([review, other])
+    assert db.insert([{**review, "text": "now a short review"}]) == [doc_id]
+
+    chunks = {}
+    for record in client.scroll("ingest", limit=100)[0]:
+        chunks.setdefault(record.payload["parent_id"], []).append(record.payload["chunk_index"])
+    assert chunks == {doc_id: [0], other_id: [0, 1, 2, 3, 4]}
+
+if __name__ == "__main__":
+    test_file_documents_are_keyed_by_source()
+    test_text_documents_are_keyed_by_text_and_labels()
+    test_checkpoint_survives_reopening()
+    test_checkpoint_ignores_a_torn_last_line()
+    test_reinserting_a_shorter_document_drops_its_old_chunks()
+    print("ingest tests passed")
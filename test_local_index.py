@@ -0,0 +1,35 @@
+import tempfile
+from qdrant_client.models import PayloadSchemaType, PointStruct, VectorParams, Distance
+from src.database import registry
+from src.database.local_index import LocalClient
+from src.database.qdrant_client import PAYLOAD_INDEXES, VectorDB, missing_payload_indexes
+
+def test_get_collection_reports_payload_indexes():
+    client = LocalClient()
+    client.create_collection("reviews", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    client.create_payload_index("reviews", "rating", field_schema=PayloadSchemaType.INTEGER)
+    client.upsert("reviews", [PointStruct(id=1, vector=[1.0, 0.0], payload={"rating": 7}),
+                              PointStruct(id=2, vector=[0.0, 1.0], payload={})])
+    info = client.get_collection("reviews")
+    assert info.points_count == 2 and info.config.params.vectors.size == 2
+    assert info.payload_schema["rating"].data_type == PayloadSchemaType.INTEGER
+    assert info.payload_schema["rating"].points == 1
+    assert not info.config.params.sparse_vectors
+
+def test_setup_does_not_rebuild_indexes_of_a_persisted_collection():
+    with tempfile.TemporaryDirectory() as path:
+        registry.clear()
+        assert VectorDB("reviews", client=LocalClient(path), hybrid=True).setup()
+        # A new process opens the same directory
+        registry.clear()
+        client = LocalClient(path)
+        info = client.get_collection("reviews")
+        assert missing_payload_indexes(info) == [] and len(info.payload_schema) == len(PAYLOAD_INDEXES)
+        assert list(info.config.params.sparse_vectors) == ["bm25"]
+        assert not VectorDB("reviews", client=client, hybrid=True).setup()
+        registry.clear()
+
+if __name__ == "__main__":
+    test_get_collection_reports_payload_indexes()
+    test_setup_does_not_rebuild_indexes_of_a_persisted_collection()
+    print("local index tests passed")
@@ -0,0 +1,32 @@
+from src.database.local_index import LocalClient
+from src.database.registry import collection_ready, collection_scope, mark_collection_ready
+
+class Client:
+    """Bare client object: the registry only tracks client identity"""
+
+def test_new_client_does_not_inherit_a_collected_clients_state():
+    client = Client()
+    mark_collection_ready(client, "reviews")
+    old_id, old_scope = id(client), collection_scope(client, "reviews")
+    assert collection_ready(client, "reviews")
+    # Freed right away by reference counting; CPython then hands its address to the next object of that size
+    del client
+    clients = [Client() for _ in range(100)]
+    assert any(id(client) == old_id for client in clients)
+    for client in clients:
+        assert not collection_ready(client, "reviews")
+        assert collection_scope(client, "reviews") != old_scope
+
+def test_ready_flags_and_scopes_are_per_client():
+    first, second = LocalClient(), LocalClient()
+    mark_collection_ready(first, "reviews")
+    assert collection_ready(first, "reviews") and not collection_ready(second, "reviews")
+    assert collection_scope(first, "reviews") == collection_scope(first, "reviews")
+    assert collection_scope(first, "reviews") != collection_scope(second, "reviews")
+    mark_collection_ready(first, "reviews", False)
+    assert not collection_ready(first, "reviews")
+
+if __name__ == "__main__":
+    test_new_client_does_not_inherit_a_collected_clients_state()
+    test_ready_flags_and_scopes_are_per_client()
+    print("registry tests passed")
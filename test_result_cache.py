@@ -0,0 +1,102 @@
+import time
+import zlib
+import numpy as np
+from config.settings import VECTOR_SIZE
+from src.database import registry
+from src.database.local_index import LocalClient
+from src.database.qdrant_client import VectorDB
+from src.database.result_cache import ResultCache
+
+SIGNATURE = ResultCache.signature("reviews", {"sentiment": "positive"}, 5)
+
+def test_key_normalizes_the_query():
+    assert ResultCache.key(SIGNATURE, " great  film ") == ResultCache.key(SIGNATURE, "great film")
+    assert ResultCache.signature("reviews", {"a": 1, "b": 2}, 5) == ResultCache.signature("reviews", {"b": 2, "a": 1}, 5)
+    assert ResultCache.signature("reviews", None, 5) != ResultCache.signature("reviews", None, 6)
+
+def test_entries_expire_after_ttl():
+    cache = ResultCache(ttl=0.05)
+    key = ResultCache.key(SIGNATURE, "great film")
+    cache.put(key, [{"id": 1}], cache.generation("reviews"))
+    assert cache.get(key) == [{"id": 1}]
+    time.sleep(0.1)
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_invalidate_drops_only_that_collection():
+    cache = ResultCache()
+    key, other = ResultCache.key(SIGNATURE, "q"), ResultCache.key(ResultCache.signature("other", None, 5), "q")
+    cache.put(key, [{"id": 1}], cache.generation("reviews"))
+    cache.put(other, [{"id": 2}], cache.generation("other"))
+    cache.invalidate("reviews")
+    assert cache.get(key) is None and cache.get(other) == [{"id": 2}]
+
+def test_results_computed_before_a_write_are_never_served():
+    cache = ResultCache()
+    key = ResultCache.key(SIGNATURE, "q")
+    generation = cache.generation("reviews")
+    cache.invalidate("reviews")  # a write lands while the search runs
+    cache.put(key, [{"id": 1}], generation)
+    assert cache.get(key) is None
+
+def test_lru_eviction_and_copies():
+    cache = ResultCache(max_items=2)
+    keys = [ResultCache.key(SIGNATURE, f"q{i}") for i in range(3)]
+    results = [{"id": 0, "data": {"tags": []}}]
+    cache.put(keys[0], results, 0)
+    cache.put(keys[1], [], 0)
+    cache.get(keys[0])
+    cache.put(keys[2], [], 0)
+    assert cache.get(keys[1]) is None and cache.get(keys[0]) is not None
+    # Callers can't mutate what the cache holds
+    results[0]["data"]["tags"].append("x")
+    cache.get(keys[0])[0]["data"]["tags"].append("y")
+    assert cache.get(keys[0]) == [{"id": 0, "data": {"tags": []}}]
+
+def test_similar_queries_share_results():
+    cache = ResultCache(similarity=0.95)
+    cache.put(ResultCache.key(SIGNATURE, "great film"), [{"id": 1}], 0, np.array([1.0, 0.0, 0.0]))
+    cache.put(ResultCache.key(SIGNATURE, "dull film"), [{"id": 2}], 0, np.array([0.0, 1.0, 0.0]))
+    assert cache.get_similar(SIGNATURE, np.array([2.0, 0.1, 0.0])) == [{"id": 1}]
+    assert cache.get_similar(SIGNATURE, np.array([1.0, 1.0, 0.0])) is None
+    assert cache.get_similar(ResultCache.signature("reviews", None, 5), np.array([1.0, 0.0, 0.0])) is None
+    cache.invalidate("reviews")
+    assert cache.get_similar(SIGNATURE, np.array([1.0, 0.0, 0.0])) is None
+
+def test_similarity_lookup_is_off_without_threshold():
+    cache = ResultCache()
+    cache.put(ResultCache.key(SIGNATURE, "great film"), [{"id": 1}], 0, np.array([1.0, 0.0]))
+    assert cache.get_similar(SIGNATURE, np.array([1.0, 0.0])) is None
+
+class OfflineVectorDB(VectorDB):
+    """VectorDB on the in-process index with a deterministic stand-in for each model name"""
+
+    def _encode(self, texts, batch_size=None, encoder=None):
+        seeds = [zlib.crc32(f"{self.model_name}:{text}".encode("utf-8")) for text in texts]
+        rows = [np.random.default_rng(seed).standard_normal(VECTOR_SIZE) for seed in seeds]
+        return np.asarray(rows, dtype=np.float32).reshape(len(texts), VECTOR_SIZE)
+
+def test_handles_with_different_settings_do_not_share_results():
+    client = LocalClient()
+    first = OfflineVectorDB("cached", client=client, model_name="model-a", use_cache=False)
+    first.insert([{"text": f"review {i}"} for i in range(5)])
+    first.search("review 1", limit=2)
+    cache = first.result_cache
+    hits = cache.hits
+    assert first.search("review 1", limit=2) and cache.hits == hits + 1
+    for other in (OfflineVectorDB("cached", client=client, model_name="model-b", use_cache=False),
+                  OfflineVectorDB("cached", client=client, model_name="model-a", use_cache=False, chunk_words=50)):
+        other.search("review 1", limit=2)
+        assert cache.hits == hits + 1
+    registry.clear()
+
+if __name__ == "__main__":
+    test_key_normalizes_the_query()
+    test_entries_expire_after_ttl()
+    test_invalidate_drops_only_that_collection()
+    test_results_computed_before_a_write_are_never_served()
+    test_lru_eviction_and_copies()
+    test_similar_queries_share_results()
+    test_similarity_lookup_is_off_without_threshold()
+    test_handles_with_different_settings_do_not_share_results()
+    print("result cache tests passed")
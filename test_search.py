@@ -1,28 +1,14 @@
 from src.database.qdrant_client import VectorDB
+from src.database.federated import FederatedSearch
 from src.data_loader import DataLoader
 
 def search_all_collections(query, limit=3):
     """Search across all three collections and return combined results"""
-    collections = {
-        "imdb_reviews": VectorDB("imdb_reviews"),
-        "sentiment_reviews": VectorDB("sentiment_reviews"),
-        "csv_reviews": VectorDB("csv_reviews")
-    }
-    
-    all_results = []
-    
-    for collection_name, db in collections.items():
-        try:
-            results = db.search(query, limit=limit)
-            for result in results:
-                result['collection'] = collection_name
-                all_results.append(result)
-        except Exception as e:
-            print(f"Error searching {collection_name}: {e}")
-    
-    # Sort by score descending
-    all_results.sort(key=lambda x: x['score'], reverse=True)
-    return all_results[:limit]
+    with FederatedSearch(["imdb_reviews", "sentiment_reviews", "csv_reviews"]) as federated:
+        results = federated.search(query, limit=limit)
+        for collection_name, error in federated.errors.items():
+            print(f"Error searching {collection_name}: {error}")
+    return results
 
 def test_search():
     # Setup data in all collections
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from qdrant_client.models import ScoredPoint
+from src.database.sparse import BM25Encoder, fuse, tokenize
+
+def hits(*ids):
+    # Scores fall with rank, as in a real result list
+    return [ScoredPoint(id=point_id, version=0, score=1.0 - rank / 10, payload={"rank": rank})
+            for rank, point_id in enumerate(ids)]
+
+def dot(document, query):
+    weights = dict(zip(document.indices, document.values))
+    return sum(weights.get(index, 0.0) * value for index, value in zip(query.indices, query.values))
+
+def test_tokenize():
+    assert tokenize("Don't stop<br />the well-made FILM_2") == ["don't", "stop", "the", "well-made", "film", "2"]
+
+def test_bm25_scores_matching_documents():
+    encoder = BM25Encoder(vocab_path=None, stats_path=None).fit(
+        ["a great film", "a dull film", "great great acting", "nothing here"])
+    documents = encoder.encode_documents(["a great film", "a dull film", "nothing here"])
+    query = encoder.encode_queries(["great film"])[0]
+    scores = [dot(document, query) for document in documents]
+    assert scores[0] > scores[1] > scores[2] == 0.0
+    # Rarer terms weigh more
+    assert encoder.idf(encoder.term_id("dull")) > encoder.idf(encoder.term_id("film"))
+    assert list(documents[0].indices) == sorted(documents[0].indices)
+
+def test_bm25_stats_round_trip():
+    encoder = BM25Encoder(vocab_path=None, stats_path=None).fit(["one two", "two three four"])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bm25.json")
+        encoder.save(path)
+        loaded = BM25Encoder(vocab_path=None, stats_path=path)
+    assert (loaded.corpus_size, loaded.avg_doc_len, loaded.doc_freqs) == (2, 2.5, encoder.doc_freqs)
+
+def test_rrf_merges_and_breaks_ties_by_first_seen():
+    fused = fuse(hits("a", "b", "c"), hits("c", "d"))
+    assert [point.id for point in fused] == ["c", "a", "b", "d"]
+    assert fused[0].score == 1 / 61 + 1 / 63
+    # "a" and "d" tie at rank 1 of their lists: the dense hit comes first
+    fused = fuse(hits("a"), hits("d"))
+    assert [point.id for point in fused] == ["a", "d"] and fused[0].score == fused[1].score
+    # Payloads are taken from the first list a point appears in
+    assert fuse(hits("x", "y"), hits("y"))[0].payload == {"rank": 1}
+
+def test_weighted_fusion():
+    fused = fuse(hits("a", "b"), hits("b", "a"), method="weighted", alpha=0.75)
+    assert [point.id for point in fused] == ["a", "b"]
+    assert [point.score for point in fused] == [0.75, 0.25]
+
+def test_unknown_fusion_method():
+    try:
+        fuse([], [], method="max")
+    except ValueError:
+        return
+    raise AssertionError("unknown fusion method was accepted")
+
+if __name__ == "__main__":
+    test_tokenize()
+    test_bm25_scores_matching_documents()
+    test_bm25_stats_round_trip()
+    test_rrf_merges_and_breaks_ties_by_first_seen()
+    test_weighted_fusion()
+    test_unknown_fusion_method()
+    print("sparse tests passed")
@@ -0,0 +1,55 @@
+import os
+import tempfile
+from src.database.text_store import TextStore
+
+def test_put_get_and_delete():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TextStore(directory)
+        store.put_many([("a", "first text"), ("b", "second ✓ text")])
+        assert len(store) == 2 and "a" in store and "c" not in store
+        assert store.get_many(["a", "b", "c"]) == {"a": "first text", "b": "second ✓ text"}
+        store.put_many([("a", "replaced")])
+        store.delete_many(["b", "missing"])
+        assert store.get("a") == "replaced" and store.get("b") is None and len(store) == 1
+        store.close()
+
+def test_reads_see_later_appends():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TextStore(directory)
+        store.put_many([("a", "x" * 100)])
+        assert store.get("a") == "x" * 100
+        # The blob grows past the current memory map
+        store.put_many([(str(i), f"text {i} " * 50) for i in range(100)])
+        assert store.get("99") == "text 99 " * 50
+        store.close()
+
+def test_reopening_restores_the_index():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TextStore(directory)
+        store.put_many([("a", "kept"), ("b", "deleted"), ("c", "old")])
+        store.delete_many(["b"])
+        store.put_many([("c", "new")])
+        store.close()
+
+        reopened = TextStore(directory)
+        assert reopened.get_many(["a", "b", "c"]) == {"a": "kept", "c": "new"}
+        reopened.close()
+
+def test_entries_past_the_blob_end_are_dropped():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TextStore(directory)
+        store.put_many([("a", "complete")])
+        store.close()
+        # An index line whose blob write never landed, as after a crash
+        with open(os.path.join(directory, "index.txt"), "a", encoding="utf-8") as f:
+            f.write("b 100000 10\n")
+        reopened = TextStore(directory)
+        assert reopened.get_many(["a", "b"]) == {"a": "complete"}
+        reopened.close()
+
+if __name__ == "__main__":
+    test_put_get_and_delete()
+    test_reads_see_later_appends()
+    test_reopening_restores_the_index()
+    test_entries_past_the_blob_end_are_dropped()
+    print("text store tests passed")
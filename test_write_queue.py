@@ -0,0 +1,94 @@
+import zlib
+import numpy as np
+from config.settings import VECTOR_SIZE
+from src.database.local_index import LocalClient
+from src.database.metrics import MetricsRegistry
+from src.database.qdrant_client import VectorDB
+from src.database.write_queue import WriteQueue
+
+class OfflineVectorDB(VectorDB):
+    """VectorDB on the in-process index with a deterministic stand-in for the embedding model"""
+
+    def _encode(self, texts, batch_size=None, encoder=None):
+        rows = [np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(VECTOR_SIZE) for text in texts]
+        return np.asarray(rows, dtype=np.float32).reshape(len(texts), VECTOR_SIZE)
+
+class FailingMetrics(MetricsRegistry):
+    """Metrics sink whose queue-depth observation raises `error`"""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def observe(self, name, value, **labels):
+        if name == "vectordb_write_queue_depth":
+            raise self.error
+        super().observe(name, value, **labels)
+
+def offline_db(metrics=None):
+    return OfflineVectorDB("write_queue", client=LocalClient(), use_cache=False, use_result_cache=False,
+                           metrics=metrics)
+
+def raises(error_type, call, *args):
+    try:
+        call(*args)
+    except error_type:
+        return True
+    return False
+
+def test_writes_apply_in_order_at_flush():
+    db = offline_db()
+    with WriteQueue(db, batch_size=4, linger_ms=5) as queue:
+        ids = queue.insert({"text": f"review {i}", "rating": i} for i in range(10))
+        queue.update(ids[0], {"text": "rewritten", "rating": 100})
+        queue.update(ids[0], {"text": "rewritten again", "rating": 200})
+        queue.delete(ids[8:])
+        queue.delete({"rating": {"lt": 3}})
+        queue.flush()
+        stored = {item["id"]: item["data"]["rating"] for item in db.get_many(ids)}
+        assert stored == {ids[0]: 200, **{ids[i]: i for i in range(3, 8)}}
+
+def test_background_errors_surface_at_flush():
+    db = offline_db()
+    queue = WriteQueue(db, linger_ms=5)
+    ids = queue.insert([{"text": "kept"}])
+    queue.flush()
+    queue.update(ids[0], {"rating": 1})  # no text to embed
+    assert raises(KeyError, queue.flush)
+    # The failed write changed nothing, the queue keeps going and the error is reported once
+    ids += queue.insert([{"text": "written later"}])
+    queue.flush()
+    assert [item["data"]["text"] for item in db.get_many(ids)] == ["kept", "written later"]
+    queue.close()
+
+def test_caller_errors_and_closed_queue():
+    db = offline_db()
+    queue = WriteQueue(db)
+    assert raises(ValueError, queue.delete, {})
+    assert raises(ValueError, queue.delete, {"$xor": []})
+    queue.close()
+    queue.close()
+    assert raises(RuntimeError, queue.insert, [{"text": "late"}])
+
+def test_writer_errors_outside_writes_release_flush():
+    queue = WriteQueue(offline_db(FailingMetrics(ValueError("metrics down"))), linger_ms=5)
+    queue.insert([{"text": "lost"}])
+    assert raises(ValueError, queue.flush)
+    assert queue._thread.is_alive()
+    # The stop barrier is released the same way
+    assert raises(ValueError, queue.close) and not queue._thread.is_alive()
+
+def test_flush_fails_once_the_writer_is_gone():
+    queue = WriteQueue(offline_db(FailingMetrics(SystemExit())), linger_ms=5)
+    queue.insert([{"text": "lost"}])
+    queue._thread.join(5)
+    assert raises(RuntimeError, queue.flush)
+    queue.close()
+
+if __name__ == "__main__":
+    test_writes_apply_in_order_at_flush()
+    test_background_errors_surface_at_flush()
+    test_caller_errors_and_closed_queue()
+    test_writer_errors_outside_writes_release_flush()
+    test_flush_fails_once_the_writer_is_gone()
+    print("write queue tests passed")